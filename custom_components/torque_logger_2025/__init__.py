@@ -4,13 +4,18 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.loader import async_get_integration
 
 from .coordinator import TorqueLoggerCoordinator
-from .api import TorqueReceiveDataView
+from .api import TorqueReceiveDataView, _normalize_account
+from .session import SessionStore
+from .backfill import StatisticsBackfill
 from .const import (
     DOMAIN,
     PLATFORMS,
@@ -20,6 +25,18 @@ from .const import (
     CONF_LANGUAGE,
     DEFAULT_LANGUAGE,
     RUNTIME_LANG_MAP,
+    SESSION_PURGE_INTERVAL_SECONDS,
+    CONF_QUEUE_POLICY,
+    DEFAULT_QUEUE_POLICY,
+    BACKFILL_FLUSH_INTERVAL_SECONDS,
+    CONF_REORDER_WINDOW,
+    DEFAULT_REORDER_WINDOW,
+    CONF_RATE_LIMIT,
+    CONF_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_BURST,
+    CONF_STALE_AFTER,
+    BACKFILL_STALE_SECONDS,
 )
 
 _LOGGER: logging.Logger = logging.getLogger(__name__)
@@ -28,7 +45,9 @@ _LOGGER: logging.Logger = logging.getLogger(__name__)
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Migrate old entry data to the latest version.
 
-    - v<2 -> v2 : injecte la langue par défaut si absente.
+    - v<2 -> v2 : injecte la langue par défaut si absente ;
+    - v<3 -> v3 : unique_id = email normalisé (une entrée par compte Torque)
+      au lieu de DOMAIN (entrée unique).
     """
     if entry.version < 2:
         data = dict(entry.data)
@@ -36,6 +55,27 @@ async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             data[CONF_LANGUAGE] = DEFAULT_LANGUAGE
         hass.config_entries.async_update_entry(entry, data=data, version=2)
         _LOGGER.debug("Migrated config entry %s to version 2", entry.entry_id)
+
+    if entry.version < 3:
+        unique_id = _normalize_account(entry.data.get(CONF_EMAIL)) or entry.unique_id
+        owner = next(
+            (
+                other
+                for other in hass.config_entries.async_entries(DOMAIN)
+                if other.entry_id != entry.entry_id and other.unique_id == unique_id
+            ),
+            None,
+        )
+        if owner is not None:
+            _LOGGER.warning(
+                "Torque account %s is already configured by entry %s; unique_id of entry %s left unchanged",
+                unique_id,
+                owner.entry_id,
+                entry.entry_id,
+            )
+            unique_id = entry.unique_id
+        hass.config_entries.async_update_entry(entry, unique_id=unique_id, version=3)
+        _LOGGER.debug("Migrated config entry %s to version 3", entry.entry_id)
     return True
 
 
@@ -49,7 +89,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Espace de stockage du domaine
     if DOMAIN not in hass.data:
         hass.data[DOMAIN] = {}
-        _LOGGER.info(STARTUP_MESSAGE)
+        integration = await async_get_integration(hass, DOMAIN)
+        _LOGGER.info(STARTUP_MESSAGE.format(version=integration.version or "0.0.0"))
 
     domain_store: dict = hass.data[DOMAIN]
 
@@ -64,32 +105,72 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Vue HTTP : la créer UNE fois, puis seulement MAJ de ses paramètres
     if "view" not in domain_store:
-        view = TorqueReceiveDataView(data={}, email=email, imperial=imperial, language=lang_rt)
+        view = TorqueReceiveDataView()
         hass.http.register_view(view)
         domain_store["view"] = view
         _LOGGER.debug("Torque view registered at %s", view.url)
+        # Échantillons en retard -> statistiques long terme
+        view.backfill = StatisticsBackfill(hass)
+        # Worker d'ingestion : traite les uploads mis en file par la vue
+        view.async_start(hass)
     else:
         view: TorqueReceiveDataView = domain_store["view"]
-        view.email = email or ""
-        view.imperial = bool(imperial)
-        view.lang = lang_rt
-        _LOGGER.debug(
-            "Torque view updated (email=%s, imperial=%s, lang=%s)",
-            view.email, view.imperial, view.lang,
+
+    # Import groupé des échantillons en retard dans le recorder : une seule minuterie
+    # pour la vue partagée (arrêtée au déchargement de la dernière entrée)
+    if "backfill_unsub" not in domain_store:
+        domain_store["backfill_unsub"] = async_track_time_interval(
+            hass, view.backfill.async_flush, timedelta(seconds=BACKFILL_FLUSH_INTERVAL_SECONDS)
         )
 
     # Store par entrée
-    store: dict = {"data": {}}
+    store: dict = {"data": SessionStore()}
     domain_store[entry.entry_id] = store
 
-    # Partage du buffer de session avec la vue
-    domain_store["view"].data = store["data"]
-
     # Coordinator
-    coordinator = TorqueLoggerCoordinator(hass, domain_store["view"], entry)
-    domain_store["view"].coordinator = coordinator
+    coordinator = TorqueLoggerCoordinator(hass, view, entry)
     store["coordinator"] = coordinator
 
+    # Routage des uploads de ce compte vers le buffer de session et le coordinator de l'entrée
+    # (réglages d'ingestion propres à l'entrée : seuls ses uploads sont concernés)
+    routed = view.add_route(
+        entry.entry_id,
+        email,
+        store["data"],
+        coordinator,
+        imperial,
+        lang_rt,
+        # Politique de la file d'ingestion quand elle est pleine
+        queue_policy=entry.options.get(CONF_QUEUE_POLICY, DEFAULT_QUEUE_POLICY),
+        # Fenêtre de réordonnancement des uploads sur le `time` Torque
+        reorder_window=float(entry.options.get(CONF_REORDER_WINDOW, DEFAULT_REORDER_WINDOW)),
+        # Limitation de débit par source (token bucket)
+        rate_limit=float(entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT)),
+        rate_burst=int(entry.options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST)),
+        # Retard (s) au-delà duquel un échantillon rejoué va aux statistiques
+        stale_after=float(entry.options.get(CONF_STALE_AFTER, BACKFILL_STALE_SECONDS)),
+    )
+    if not routed:
+        # Compte déjà routé vers une autre entrée : on ne la remplace pas
+        domain_store.pop(entry.entry_id, None)
+        return False
+    _LOGGER.debug(
+        "Torque route added (entry=%s, imperial=%s, lang=%s)", entry.entry_id, bool(imperial), lang_rt
+    )
+
+    # Purge périodique des sessions expirées (hors chemin d'ingestion)
+    @callback
+    def _purge_sessions(_now) -> None:
+        purged = store["data"].purge_expired()
+        if purged:
+            _LOGGER.debug("Purged %d expired Torque sessions", purged)
+
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, _purge_sessions, timedelta(seconds=SESSION_PURGE_INTERVAL_SECONDS)
+        )
+    )
+
     # Charger les plateformes
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
@@ -113,15 +194,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         return True
 
     domain_store: dict = hass.data[DOMAIN]
-    domain_store.pop(entry.entry_id, None)
+    store = domain_store.pop(entry.entry_id, None)
+    if store and (coordinator := store.get("coordinator")) is not None:
+        coordinator.async_cancel_discovery()
 
-    still_has_entries = any(k for k in domain_store.keys() if k != "view")
     view: TorqueReceiveDataView | None = domain_store.get("view")
-
-    if view and not still_has_entries:
-        view.coordinator = None
-        view.data = {}
-        _LOGGER.debug("Torque view kept registered but detached (no active entries).")
+    if view:
+        view.remove_route(entry.entry_id)
+        _LOGGER.debug("Torque route removed (entry=%s); view kept registered.", entry.entry_id)
+        # Dernière entrée déchargée : minuterie arrêtée, échantillons restants importés
+        if not view.routes and (unsub := domain_store.pop("backfill_unsub", None)) is not None:
+            unsub()
+            view.backfill.async_flush()
 
     return True
 
@@ -2,25 +2,74 @@
 """Torque Logger 2025 API Client/DataView."""
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Mapping, NamedTuple, Optional
+from urllib.parse import unquote_plus
+import asyncio
 import logging
+import math
+import threading
 import time
 
 from aiohttp import web
-import pint
-from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
 from homeassistant.util import slugify
 from homeassistant.config_entries import ConfigEntryState
-
-from .const import TORQUE_CODES, SESSION_TTL_SECONDS, MAX_SESSIONS
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    TORQUE_CODES,
+    FIELD_CACHE_MAX_ENTRIES,
+    DEFAULT_REORDER_WINDOW,
+    DEFAULT_QUEUE_POLICY,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_BURST,
+    ROUTE_ID_CACHE_MAX,
+    BACKFILL_STALE_SECONDS,
+    REJECT_MISSING_SESSION,
+    REJECT_NO_ENTRY,
+    REJECT_ENTRY_NOT_LOADED,
+    REJECT_MISSING_ACCOUNT,
+    REJECT_UNKNOWN_ACCOUNT,
+    REJECT_REASONS,
+    INGEST_BACKLOG_DEPTH,
+    INGEST_BACKLOG_SECONDS,
+)
+from .backfill import StatisticsBackfill, torque_timestamp
+from .ingest import IngestItem, IngestQueue, RateLimiter, ReorderBuffer
+from .session import RecentUploads, SessionRecord, SessionStore
 
 if TYPE_CHECKING:
+    import pint
+
     from .coordinator import TorqueLoggerCoordinator
 
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
 # --- Conversion d’unités ---
-ureg = pint.UnitRegistry()
+# Registre pint construit à la demande (coûteux : import + parsing des définitions),
+# uniquement quand une conversion impériale est nécessaire, et hors boucle d'événements.
+_ureg: Optional["pint.UnitRegistry"] = None
+_ureg_lock = threading.Lock()
+
+def _get_ureg() -> "pint.UnitRegistry":
+    """Retourne le registre pint, construit au premier appel (bloquant)."""
+    global _ureg
+    if _ureg is None:
+        with _ureg_lock:
+            if _ureg is None:
+                import pint  # import différé : lourd au chargement de l'intégration
+
+                _ureg = pint.UnitRegistry()
+                _LOGGER.debug("pint UnitRegistry initialised")
+    return _ureg
+
+def unit_registry_ready() -> bool:
+    """True si le registre pint est déjà construit."""
+    return _ureg is not None
 
 # Mappage d’unités pour l’affichage "joli" et les conversions impériales
 imperial_units = {"km": "mi", "°C": "°F", "km/h": "mph", "m": "ft"}
@@ -33,8 +82,33 @@ prettyPint = {
     "kilometer": "km",
     "meter": "m",
     "foot": "ft",
+    # Noms longs renvoyés par str(Quantity.units)
+    "degree_Celsius": "°C",
+    "degree_Fahrenheit": "°F",
+    # Pression / débit / couple / puissance (cf. DEFAULT_*_METRIC/IMPERIAL de const.py)
+    "kilopascal": "kPa",
+    "bar": "bar",
+    "pound_force_per_square_inch": "psi",
+    "inch_Hg": "inHg",
+    "gram / second": "g/s",
+    "kilogram / hour": "kg/h",
+    "pound / minute": "lb/min",
+    "gallon / minute": "gal/min",
+    "meter * newton": "Nm",
+    "newton * meter": "Nm",
+    "foot * force_pound": "ft-lb",
+    "kilowatt": "kW",
+    "horsepower": "hp",
+    "metric_horsepower": "cv",
 }
 
+# Libellé "joli" -> nom pint (premier nom rencontré prioritaire)
+_UNPRETTY: dict[str, str] = {}
+for _pint_unit, _pretty_unit in prettyPint.items():
+    _UNPRETTY.setdefault(_pretty_unit, _pint_unit)
+# Alias d'affichage sans équivalent direct dans prettyPint
+_UNPRETTY.update({"lb-ft": "foot * force_pound", "bhp": "horsepower"})
+
 # --- Libellés localisés (par libellé complet) ---
 LABELS = {
     "fr": {
@@ -272,10 +346,11 @@ FR_BY_KEY: dict[str, str] = {
 }
 
 # --- Auto-build FR_BY_KEY from LABELS + TORQUE_CODES -------------------------
-def _auto_fr_by_key_from_labels() -> dict[str, str]:
+# Tables matérialisées au premier usage (slugify sur tout TORQUE_CODES).
+@lru_cache(maxsize=None)
+def _fr_by_key_auto() -> dict[str, str]:
     fr_map: dict[str, str] = {}
-    labels_fr = LABELS.get("fr", {})
-    labels_fr_cf = {k.casefold(): v for k, v in labels_fr.items()}
+    labels_fr_cf = _labels_casefold("fr")
     for _, defs in TORQUE_CODES.items():
         short_raw = defs.get("shortName", "")
         full_raw = defs.get("fullName", "")
@@ -285,103 +360,419 @@ def _auto_fr_by_key_from_labels() -> dict[str, str]:
             fr_map[short_key] = labels_fr_cf[full_key]
     return fr_map
 
-FR_BY_KEY_AUTO = _auto_fr_by_key_from_labels()
+@lru_cache(maxsize=None)
+def _labels_casefold(lang: str) -> dict[str, str]:
+    """Libellés d'une langue indexés par libellé complet casefold."""
+    return {k.casefold(): v for k, v in LABELS.get(lang, {}).items()}
+
+# Langues gérées par l'API (libellés de capteurs)
+API_LANGS: tuple[str, ...] = ("en", "fr")
+
+class _LabelIndex(NamedTuple):
+    """Index immuable des libellés d'une langue (partagé entre requêtes)."""
+
+    by_key: Mapping[str, str]   # shortName slugifié -> libellé
+    by_name: Mapping[str, str]  # libellé complet casefold -> libellé
+
+@lru_cache(maxsize=None)
+def _label_index(lang: str) -> _LabelIndex:
+    """Index des libellés d'une langue, construit une seule fois."""
+    if lang != "fr":
+        return _LabelIndex(MappingProxyType({}), MappingProxyType(_labels_casefold(lang)))
+    # Priorité clé statique -> clé auto
+    by_key = {**_fr_by_key_auto(), **FR_BY_KEY}
+    return _LabelIndex(MappingProxyType(by_key), MappingProxyType(_labels_casefold("fr")))
 
 def _pretty_units(unit: str) -> str:
     return prettyPint.get(unit, unit)
 
 def _unpretty_units(unit: str) -> str:
-    for pint_unit, pretty_unit in prettyPint.items():
-        if pretty_unit == unit:
-            return pint_unit
-    return unit
+    return _UNPRETTY.get(unit, unit)
 
-def _convert_units(value: float, u_in: str, u_out: str):
-    q_in = ureg.Quantity(value, u_in)
-    q_out = q_in.to(u_out)
-    return {"value": round(q_out.magnitude, 2), "unit": str(q_out.units)}
+# --- Moteur de conversion compilé ---------------------------------------------
+# (u_in, u_out) -> (fonction float -> float, unité de sortie "jolie").
+# pint n'est interrogé qu'à la première conversion d'un couple d'unités :
+# les unités affines (°C/°F, km/mi, kPa/psi, ...) deviennent un simple a*x+b.
+_CONVERTERS: dict[tuple[str, str], tuple[Callable[[float], float], str]] = {}
 
-def _pretty_convert_units(value: float, u_in: str, u_out: str):
+def _compile_converter(u_in: str, u_out: str) -> tuple[Callable[[float], float], str]:
     p_in = _unpretty_units(u_in)
     p_out = _unpretty_units(u_out)
-    res = _convert_units(value, p_in, p_out)
-    return {"value": res["value"], "unit": _pretty_units(res["unit"])}
 
-def _localize(lang: str, name: str) -> str:
-    """Retourne le libellé localisé, insensible à la casse."""
-    loc = LABELS.get(lang)
-    if not loc or not name:
-        return name
-    return loc.get(name, loc.get(name.casefold(), name))
+    def _pint_convert(value: float) -> float:
+        return float(ureg.Quantity(value, p_in).to(p_out).magnitude)
+
+    ureg = _get_ureg()
+    q_one = ureg.Quantity(1.0, p_in).to(p_out)
+    unit = _pretty_units(str(q_one.units))
+    offset = _pint_convert(0.0)
+    scale = float(q_one.magnitude) - offset
+
+    # Vérifie l'affinité sur un second point ; sinon (ex. unités logarithmiques)
+    # on garde l'appel pint pour ce couple uniquement.
+    if not math.isclose(_pint_convert(100.0), scale * 100.0 + offset, rel_tol=1e-9, abs_tol=1e-9):
+        return _pint_convert, unit
+    if offset == 0.0:
+        return (lambda value: value * scale), unit
+    return (lambda value: value * scale + offset), unit
+
+def _get_converter(u_in: str, u_out: str) -> tuple[Callable[[float], float], str]:
+    """Retourne (convertisseur, unité de sortie) pour un couple d'unités, mis en cache."""
+    conv = _CONVERTERS.get((u_in, u_out))
+    if conv is None:
+        conv = _CONVERTERS[(u_in, u_out)] = _compile_converter(u_in, u_out)
+    return conv
+
+class _FieldDescriptor(NamedTuple):
+    """Résolution pré-calculée d'un PID (clé, libellé, unité, convertisseur)."""
+
+    short_key: str
+    name: str
+    unit: str
+    convert: Optional[Callable[[Any], Any]]
+
+
+def _make_converter(key: str, u_in: str, u_out: str) -> Callable[[Any], Any]:
+    """Construit le convertisseur de valeur d'un PID (valeur brute -> valeur convertie)."""
+    func, _ = _get_converter(u_in, u_out)
+
+    def _convert(value):
+        if value in (None, ""):
+            return value
+        try:
+            return round(func(float(value)), 2)
+        except (ValueError, TypeError):
+            _LOGGER.debug("Unit conversion skipped for %s=%r %s", key, value, u_in)
+            return value
+
+    return _convert
+
+
+# --- Parsing de la query Torque ----------------------------------------------
+# Emplacements cibles d'une clé dans _TorqueQuery (index dans le tuple des buckets ;
+# les valeurs `k*` sont traitées à part, avant l'aiguillage)
+_SLOT_SHORT_NAME = 1
+_SLOT_FULL_NAME = 2
+_SLOT_DEFAULT_UNIT = 3
+_SLOT_PROFILE = 4  # (hors métadonnées)
+# Traitements spéciaux
+_SLOT_SKIP = -1
+_SLOT_TIME = -2
+_SLOT_SESSION = -3
+
+# Aiguillage par 1er caractère de la clé : (préfixe, longueur, emplacement, nom fixe, exact)
+# -> une seule recherche dictionnaire par clé, puis au plus 3 startswith.
+_QUERY_ROUTES: dict[str, tuple[tuple[str, int, int, Optional[str], bool], ...]] = {
+    "u": (
+        ("userShortName", 13, _SLOT_SHORT_NAME, None, False),
+        ("userFullName", 12, _SLOT_FULL_NAME, None, False),
+        ("userUnit", 8, _SLOT_SKIP, None, False),
+    ),
+    "d": (("defaultUnit", 11, _SLOT_DEFAULT_UNIT, None, False),),
+    # ex: profileName -> Name
+    "p": (("profile", 7, _SLOT_PROFILE, None, False),),
+    "e": (("eml", 3, _SLOT_PROFILE, "email", True),),
+    "v": (("v", 1, _SLOT_PROFILE, "version", True),),
+    "i": (("id", 2, _SLOT_PROFILE, "id", True),),
+    "t": (("time", 4, _SLOT_TIME, None, True),),
+    "s": (("session", 7, _SLOT_SESSION, None, True),),
+    # Langue : lue dans la query brute par la vue (cf. get), ignorée ici
+    "l": (("lang", 4, _SLOT_SKIP, None, True), ("language", 8, _SLOT_SKIP, None, True)),
+}
+
+
+class _TorqueQuery:
+    """Résultat du parsing d'une requête Torque (avant fusion dans la session).
+
+    Les métadonnées (userShortName*, userFullName*, defaultUnit*) sont gardées
+    brutes dans `meta` : elles ne sont décodées (`decode_meta`) que si leur
+    empreinte diffère de celle déjà connue pour la session.
+    """
+
+    __slots__ = (
+        "session",
+        "time",
+        "received",
+        "value",
+        "shortName",
+        "fullName",
+        "defaultUnit",
+        "profile",
+        "unknown",
+        "meta",
+        "_decode",
+    )
+
+    def __init__(self, decode: Callable[[str], str]) -> None:
+        self.session: Optional[str] = None
+        self.time: Optional[int] = None
+        self.received: Optional[float] = None  # réception (epoch HA), cf. SessionClock
+        self.value: dict[str, str] = {}
+        self.shortName: dict[str, str] = {}
+        self.fullName: dict[str, str] = {}
+        self.defaultUnit: dict[str, str] = {}
+        self.profile: dict[str, str] = {}
+        self.unknown: list[tuple[str, str]] = []
+        self.meta: list[tuple[int, str, str]] = []
+        self._decode = decode
+
+    @property
+    def meta_fingerprint(self) -> Optional[int]:
+        """Empreinte des métadonnées reçues (None si la requête n'en contient pas)."""
+        return hash(tuple(self.meta)) if self.meta else None
+
+    def decode_meta(self) -> None:
+        """Décode les métadonnées brutes dans shortName/fullName/defaultUnit."""
+        buckets = (None, self.shortName, self.fullName, self.defaultUnit)
+        decode = self._decode
+        for slot, item, raw in self.meta:
+            buckets[slot][item] = decode(raw)
+
+
+def _unquote(value: str) -> str:
+    if "%" in value or "+" in value:
+        return unquote_plus(value)
+    return value
+
+
+def _identity(value: str) -> str:
+    return value
+
+
+def _iter_query_pairs(raw: str | Mapping[str, str]) -> Iterable[tuple[str, str]]:
+    """Couples (clé décodée, valeur brute) d'une query brute ou d'un mapping."""
+    if not isinstance(raw, str):
+        return raw.items()
+    pairs = []
+    append = pairs.append
+    for part in raw.split("&"):
+        if not part:
+            continue
+        key, _, value = part.partition("=")
+        if "%" in key or "+" in key:
+            key = unquote_plus(key)
+        append((key, value))
+    return pairs
+
+
+def _peek_param(raw: str, name: str) -> Optional[str]:
+    """Valeur décodée du 1er paramètre `name` d'une query brute, sans la parser en entier."""
+    needle = name + "="
+    if raw.startswith(needle):
+        start = len(needle)
+    else:
+        pos = raw.find("&" + needle)
+        if pos < 0:
+            return None
+        start = pos + 1 + len(needle)
+    end = raw.find("&", start)
+    return _unquote(raw[start:] if end < 0 else raw[start:end])
+
+
+def _parse_query(raw: str | Mapping[str, str]) -> _TorqueQuery:
+    """Parse en une passe la query Torque (brute ou mapping) par aiguillage de préfixe."""
+    decode = _unquote if isinstance(raw, str) else _identity
+    query = _TorqueQuery(decode)
+    value_bucket = query.value
+    profile_bucket = query.profile
+    meta_append = query.meta.append
+    routes_get = _QUERY_ROUTES.get
+    unknown = query.unknown
+
+    for key, value in _iter_query_pairs(raw):
+        head = key[:1]
+        if head == "k":
+            # Valeurs de PID (l'essentiel des clés) : sans passer par la table
+            item = key[1:]
+            if len(item) == 1:
+                item = "0" + item
+            value_bucket[item] = decode(value)
+            continue
+        for prefix, plen, slot, fixed, exact in routes_get(head, ()):
+            if exact:
+                if key != prefix:
+                    continue
+            elif not key.startswith(prefix):
+                continue
+
+            if slot == _SLOT_PROFILE:
+                profile_bucket[fixed or key[plen:]] = decode(value)
+            elif slot > 0:
+                # Métadonnées : décodage différé (cf. _TorqueQuery.decode_meta)
+                meta_append((slot, key[plen:], value))
+            elif slot == _SLOT_TIME:
+                try:
+                    query.time = int(decode(value))
+                except (ValueError, TypeError):
+                    query.time = 0
+            elif slot == _SLOT_SESSION:
+                query.session = decode(value)
+            break
+        else:
+            unknown.append((key, decode(value)))
+
+    return query
+
+
+class _SessionLayout(NamedTuple):
+    """Résolution figée des PIDs d'une session pour un schéma donné."""
+
+    schema: tuple
+    fields: tuple[tuple[str, str, _FieldDescriptor], ...]  # (pid, clé publiée, descripteur)
+    meta: Mapping[str, Mapping[str, str]]  # figé (MappingProxyType)
+
+
+def _normalize_account(value: Optional[str]) -> str:
+    """Forme normalisée d'un email / id Torque pour le routage."""
+    return (value or "").strip().lower()
+
+
+class _Route:
+    """Entrée de configuration destinataire des uploads d'un compte Torque.
+
+    Porte aussi les réglages d'ingestion de l'entrée (politique de file,
+    fenêtre de réordonnancement, débit, seuil de retard), appliqués à ses
+    seuls uploads.
+    """
+
+    __slots__ = (
+        "entry_id",
+        "email",
+        "data",
+        "coordinator",
+        "imperial",
+        "lang",
+        "queue_policy",
+        "reorder_window",
+        "rate_limit",
+        "rate_burst",
+        "stale_after",
+    )
+
+    def __init__(
+        self,
+        entry_id: str,
+        email: str,
+        data: SessionStore,
+        coordinator: "TorqueLoggerCoordinator",
+        imperial: bool,
+        lang: str,
+        *,
+        queue_policy: str = DEFAULT_QUEUE_POLICY,
+        reorder_window: float = DEFAULT_REORDER_WINDOW,
+        rate_limit: float = DEFAULT_RATE_LIMIT,
+        rate_burst: int = DEFAULT_RATE_BURST,
+        stale_after: float = BACKFILL_STALE_SECONDS,
+    ) -> None:
+        self.entry_id = entry_id
+        self.email = email  # normalisé ; "" = accepte tous les comptes
+        self.data = data
+        self.coordinator = coordinator
+        self.imperial = bool(imperial)
+        lang = (lang or "en").lower()
+        self.lang = lang if lang in API_LANGS else "en"
+        self.queue_policy = queue_policy
+        self.reorder_window = float(reorder_window)
+        self.rate_limit = float(rate_limit)
+        self.rate_burst = max(1, int(rate_burst))
+        self.stale_after = float(stale_after)
+
+    def diagnostics(self) -> dict[str, Any]:
+        return {
+            "has_email": bool(self.email),
+            "imperial": self.imperial,
+            "lang": self.lang,
+            "queue_policy": self.queue_policy,
+            "reorder_window": self.reorder_window,
+            "rate_limit": self.rate_limit,
+            "rate_burst": self.rate_burst,
+            "stale_after": self.stale_after,
+        }
+
 
 class TorqueReceiveDataView(HomeAssistantView):
-    """Handle data from Torque requests."""
+    """Handle data from Torque requests.
+
+    Une seule vue HTTP pour toutes les entrées : chaque upload est routé en O(1)
+    vers l'entrée de son compte (email `eml`, sinon id Torque déjà vu avec cet
+    email), qui porte son store de sessions et son coordinator.
+    """
 
     url = "/api/torque_logger_2025"
     name = "api:torque_logger_2025"
     requires_auth = False  # recommandé pour envoi direct par Torque
 
-    coordinator: Optional["TorqueLoggerCoordinator"]
-
-    def __init__(self, data: dict, email: str, imperial: bool, language: str = "en"):
+    def __init__(self):
         """Initialize a Torque view."""
-        self.data = data
-        self.email = (email or "").strip()
-        self.imperial = bool(imperial)
-        self.lang = (language or "en").lower()
-        if self.lang not in ("en", "fr"):
-            self.lang = "en"
-        self.coordinator = None  # injecté par __init__.py
+        # Routage : email normalisé -> route ; id Torque -> route (appris, borné)
+        self.routes: dict[str, _Route] = {}
+        self._routes_by_id: OrderedDict[str, _Route] = OrderedDict()
+        # Cache des descripteurs de PID :
+        # (pid, shortName, fullName, defaultUnit, langue, impérial) -> _FieldDescriptor
+        self._field_cache: dict[tuple, _FieldDescriptor] = {}
+        # File d'ingestion : `get()` y dépose la query brute, un worker la traite
+        self.queue = IngestQueue()
+        # Uploads récents par session : doublons écartés avant parsing
+        self.recent = RecentUploads()
+        self.hass = None
+        self._worker: Optional[asyncio.Task] = None
+        # Statistiques des échantillons en retard (injecté par __init__.py)
+        self.backfill: Optional[StatisticsBackfill] = None
+        self.stats: dict[str, int] = {
+            "bursts": 0,
+            "samples_coalesced": 0,
+            "late_samples": 0,
+        }
+        # Uploads écartés par le pré-contrôle (cf. _precheck), par motif
+        self.rejected: dict[str, int] = dict.fromkeys(REJECT_REASONS, 0)
+        # Réordonnancement par session sur le `time` Torque (fenêtre de l'entrée, 0 = désactivé)
+        self.reorder = ReorderBuffer()
+        self._reorder_unsub: Optional[CALLBACK_TYPE] = None
+        # Limitation de débit par source ; excès fusionné dans l'upload retenu (cf. merge_uploads)
+        self.throttle = RateLimiter()
+        self._throttle_unsub: Optional[CALLBACK_TYPE] = None
 
     async def get(self, request):
-        """Handle Torque data GET request."""
-        try:
-            _LOGGER.debug("Torque payload: %s", dict(request.query))
-
-            # 1) ?lang=fr|en (prioritaire)
-            orig_lang = None
-            lang_param = (request.query.get("lang") or request.query.get("language") or "").lower()
-            if lang_param in ("en", "fr"):
-                orig_lang = self.lang
-                self.lang = lang_param
-            else:
-                # 2) Fallback : Accept-Language (fr en priorité, sinon en)
-                try:
-                    al = (request.headers.get("Accept-Language") or "").lower()
-                    chosen = None
-                    for token in al.split(","):
-                        tag = token.split(";")[0].strip()
-                        if tag.startswith("fr"):
-                            chosen = "fr"
-                            break
-                        if tag.startswith("en") and chosen is None:
-                            chosen = "en"
-                    if chosen in ("en", "fr"):
-                        orig_lang = self.lang
-                        self.lang = chosen
-                except Exception:
-                    pass
-
-            # 3) Parser, publier, nettoyer
-            session = self.parse_fields(request.query)
-            if session:
-                # Maj activité
-                try:
-                    self.data[session]["last_seen"] = time.time()
-                except Exception:
-                    pass
-                await self._async_publish_data(session)
-
-            # Purge sessions inactives / excédentaires
-            try:
-                self._cleanup_sessions(keep=session)
-            except Exception:
-                pass
-
-            # 4) Rétablir la langue d’origine si override ponctuel
-            if orig_lang:
-                self.lang = orig_lang
+        """Handle Torque data GET request.
 
+        Validation minimale puis mise en file : Torque reçoit `OK!` sans attendre
+        le parsing, les conversions ni l'écriture des états (cf. _async_process_batch).
+        """
+        try:
+            # Query brute (non décodée) : `request.query_string` est déjà décodée par yarl
+            raw = request.rel_url.raw_query_string
+            _LOGGER.debug("Torque payload: %s", raw)
+
+            # Pré-contrôle (session, eml, id seulement) : rien n'est alloué si rejeté
+            session = _peek_param(raw, "session")
+            torque_id = _peek_param(raw, "id")
+            route, reason = self._precheck(session, _peek_param(raw, "eml"), torque_id)
+            if route is None:
+                self.rejected[reason] += 1
+                _LOGGER.debug("Ignoring Torque payload (%s, session=%s)", reason, session)
+                # Toujours `OK!` : Torque renverrait indéfiniment un upload refusé
+                return web.Response(text="OK!")
+
+            # Renvoi d'un upload déjà reçu (Torque réessaie faute de réponse rapide)
+            torque_time = _peek_param(raw, "time")
+            if torque_time and self.recent.seen(session, torque_time, raw):
+                _LOGGER.debug("Duplicate Torque upload ignored (session=%s, time=%s)", session, torque_time)
+                return web.Response(text="OK!")
+
+            lang = self._request_lang(
+                _peek_param(raw, "lang") or _peek_param(raw, "language"), request, route.lang
+            )
+            item = IngestItem(torque_id or session, raw, lang, route=route)
+            hass = request.app[KEY_HASS]
+            # Débit par source (id Torque sinon session, et adresse distante)
+            if not self.throttle.admit(
+                (route.entry_id, item.key, request.remote), item, route.rate_limit, route.rate_burst
+            ):
+                self._schedule_throttle_release(hass)
+                return web.Response(text="OK!")
+
+            self.queue.put(item, route.queue_policy)
+            self._ensure_worker(hass)
             return web.Response(text="OK!")
 
         except Exception as err:
@@ -389,98 +780,357 @@ class TorqueReceiveDataView(HomeAssistantView):
             _LOGGER.exception("Error handling Torque payload: %s", err)
             return web.Response(text="OK!")
 
-    def parse_fields(self, qdata):  # noqa
-        """Parse les champs de la requête Torque et remplit le buffer de session."""
-        session: str = qdata.get("session")
+    @callback
+    def _schedule_throttle_release(self, hass) -> None:
+        """Programme la remise en file des uploads retenus par la limitation de débit."""
+        if self._throttle_unsub is not None:
+            return
+        delay = self.throttle.next_deadline()
+        if delay is None:
+            return
+
+        @callback
+        def _release(_now) -> None:
+            self._throttle_unsub = None
+            for item in self.throttle.pop_ready():
+                self.queue.put(item, item.route.queue_policy)
+            if len(self.queue):
+                self._ensure_worker(hass)
+            self._schedule_throttle_release(hass)
+
+        self._throttle_unsub = async_call_later(hass, delay, _release)
+
+    def _precheck(
+        self, session: Optional[str], email: Optional[str], torque_id: Optional[str]
+    ) -> tuple[Optional[_Route], Optional[str]]:
+        """Contrôle rapide d'un upload : (route, None) s'il est accepté, sinon (None, motif)."""
         if not session:
-            raise web.HTTPBadRequest(text="Missing session")
+            return None, REJECT_MISSING_SESSION
+        if not self.routes:
+            return None, REJECT_NO_ENTRY
+        route = self._resolve_route(email, torque_id)
+        if route is None:
+            return None, REJECT_UNKNOWN_ACCOUNT if email else REJECT_MISSING_ACCOUNT
+        entry = getattr(route.coordinator, "entry", None)
+        if entry is None or entry.state != ConfigEntryState.LOADED:
+            return None, REJECT_ENTRY_NOT_LOADED
+        return route, None
+
+    # --------- Routage par compte ----------
+    def add_route(
+        self,
+        entry_id: str,
+        email: str,
+        data: SessionStore,
+        coordinator: "TorqueLoggerCoordinator",
+        imperial: bool,
+        lang: str,
+        **settings: Any,
+    ) -> bool:
+        """Branche une entrée de configuration (remplace sa route précédente).
+
+        `settings` : réglages d'ingestion de l'entrée (cf. _Route).
+        Retourne False (sans rien remplacer) si le compte est déjà routé vers une autre entrée.
+        """
+        self.remove_route(entry_id)
+        route = _Route(entry_id, _normalize_account(email), data, coordinator, imperial, lang, **settings)
+        existing = self.routes.get(route.email)
+        if existing is not None:
+            _LOGGER.error(
+                "Torque account %r is already handled by config entry %s; entry %s not routed",
+                route.email or "*",
+                existing.entry_id,
+                entry_id,
+            )
+            return False
+        self.routes[route.email] = route
+        return True
+
+    def remove_route(self, entry_id: str) -> None:
+        """Débranche une entrée de configuration."""
+        for email, route in list(self.routes.items()):
+            if route.entry_id == entry_id:
+                del self.routes[email]
+        for torque_id, route in list(self._routes_by_id.items()):
+            if route.entry_id == entry_id:
+                del self._routes_by_id[torque_id]
+
+    def _resolve_route(self, email: Optional[str], torque_id: Optional[str]) -> Optional[_Route]:
+        """Route d'un upload : par email, sinon par id Torque appris, sinon route ouverte."""
+        torque_id = _normalize_account(torque_id)
+        email = _normalize_account(email)
+        if email:
+            route = self.routes.get(email) or self.routes.get("")
+            if route is not None and torque_id:
+                self._routes_by_id[torque_id] = route
+                self._routes_by_id.move_to_end(torque_id)
+                while len(self._routes_by_id) > ROUTE_ID_CACHE_MAX:
+                    self._routes_by_id.popitem(last=False)
+            return route
+        if torque_id and (route := self._routes_by_id.get(torque_id)) is not None:
+            return route
+        return self.routes.get("")
+
+    # --------- Worker d'ingestion ----------
+    @callback
+    def async_start(self, hass) -> None:
+        """Démarre (une seule fois) le worker qui vide la file d'ingestion."""
+        self._ensure_worker(hass)
+
+    def _ensure_worker(self, hass) -> None:
+        if self._worker is not None and not self._worker.done():
+            return
+        self.hass = hass
+        self._worker = hass.async_create_background_task(
+            self.queue.async_run(self._async_process_batch),
+            name="torque_logger_2025 ingest",
+        )
 
-        if session not in self.data:
-            self.data[session] = {
-                "profile": {},
-                "unit": {},
-                "defaultUnit": {},
-                "fullName": {},
-                "shortName": {},
-                "value": {},
-                "unknown": [],
-                "time": 0,
-                "last_seen": time.time(),
-            }
-        else:
-            # Refresh activity timestamp for existing session
-            self.data[session]["last_seen"] = time.time()
+    async def _async_process_batch(self, batch: list[IngestItem]) -> None:
+        """Parse un lot d'uploads et l'ingère, via la fenêtre de réordonnancement."""
+        # Registre pint construit hors boucle d'événements à la 1re conversion impériale
+        if not unit_registry_ready() and any(item.route.imperial for item in batch):
+            await self.hass.async_add_executor_job(_get_ureg)
 
-        for key, value in qdata.items():
-            if key.startswith("userUnit"):
-                continue
-            if key.startswith("userShortName"):
-                item = key[13:]
-                self.data[session]["shortName"][item] = value
-                continue
-            if key.startswith("userFullName"):
-                item = key[12:]
-                self.data[session]["fullName"][item] = value
-                continue
-            if key.startswith("defaultUnit"):
-                item = key[11:]
-                self.data[session]["defaultUnit"][item] = value
-                continue
-            if key.startswith("k"):
-                item = key[1:]
-                if len(item) == 1:
-                    item = "0" + item
-                self.data[session]["value"][item] = value
-                continue
-            if key.startswith("profile"):
-                # ex: profileName -> Name
-                item = key[7:]
-                self.data[session]["profile"][item] = value
-                continue
-            if key == "eml":
-                self.data[session]["profile"]["email"] = value
-                continue
-            if key == "time":
-                try:
-                    self.data[session]["time"] = int(value)
-                except (ValueError, TypeError):
-                    self.data[session]["time"] = 0
-                continue
-            if key == "v":
-                self.data[session]["profile"]["version"] = value
-                continue
-            if key == "session":
+        ready: list[tuple[str, _TorqueQuery, _Route]] = []
+        now, monotonic = time.time(), time.monotonic()
+        for item in batch:
+            try:
+                query = _parse_query(item.query)
+            except Exception as err:
+                _LOGGER.exception("Error handling Torque payload: %s", err)
                 continue
-            if key == "id":
-                self.data[session]["profile"]["id"] = value
+            # Heure de réception (epoch), indépendante du temps passé en file / fenêtre
+            query.received = now - (monotonic - item.received)
+            ts = torque_timestamp(query.time)
+            window = item.route.reorder_window
+            if window > 0 and ts is not None and query.session:
+                self.reorder.push(
+                    (item.route.entry_id, query.session), ts, (item.lang, query, item.route), window
+                )
+            else:
+                ready.append((item.lang, query, item.route))
+
+        if len(self.reorder):
+            ready.extend(payload for _, payload in self.reorder.pop_ready())
+            self._schedule_reorder_release()
+
+        # Retard d'ingestion : nombreux uploads en attente, ou lot resté longtemps en file
+        backlog = len(batch) + len(self.queue) >= INGEST_BACKLOG_DEPTH or (
+            monotonic - min(item.received for item in batch) >= INGEST_BACKLOG_SECONDS
+        )
+        await self._async_ingest(ready, backlog)
+
+    @callback
+    def _schedule_reorder_release(self) -> None:
+        """Programme la sortie des échantillons encore retenus par la fenêtre."""
+        if self._reorder_unsub is not None:
+            self._reorder_unsub()
+            self._reorder_unsub = None
+        delay = self.reorder.next_deadline()
+        if delay is None:
+            return
+
+        @callback
+        def _release(_now) -> None:
+            self._reorder_unsub = None
+            ready = [payload for _, payload in self.reorder.pop_ready()]
+            self._schedule_reorder_release()
+            if ready:
+                self.hass.async_create_background_task(
+                    self._async_ingest(ready), name="torque_logger_2025 reorder"
+                )
+
+        self._reorder_unsub = async_call_later(self.hass, delay, _release)
+
+    async def _async_ingest(
+        self, uploads: list[tuple[str, _TorqueQuery, _Route]], backlog: bool = False
+    ) -> None:
+        """Fusionne des uploads parsés dans leur session et publie vers les entités.
+
+        Hors retard d'ingestion, chaque upload est publié dans l'ordre. En rafale
+        (`backlog` : p. ex. cache vidé après une zone blanche), seul le plus récent
+        de chaque session est publié vers les entités ; les échantillons
+        intermédiaires vont au backfill de statistiques (cf. _route_backfill).
+        """
+        # (entrée, session) -> (langue, dernier upload, route) ; ordre de 1re apparition conservé
+        latest: dict[tuple[str, str], tuple[str, _TorqueQuery, _Route]] = {}
+        coalesced = 0
+        for lang, query, route in uploads:
+            try:
+                # (purge TTL : minuterie périodique par entrée, cf. __init__._purge_sessions)
+                session = self.parse_fields(query, route)
+                if not session:
+                    continue
+                if backlog:
+                    previous = latest.get((route.entry_id, session))
+                    if previous is not None:
+                        coalesced += 1
+                        self._route_backfill(route, session, previous[1].time, previous[1].value)
+                    latest[(route.entry_id, session)] = (lang, query, route)
+                    continue
+            except Exception as err:
+                _LOGGER.exception("Error handling Torque payload: %s", err)
                 continue
+            await self._async_publish_logged(route, session, lang)
 
-            self.data[session]["unknown"].append({"key": key, "value": value})
+        if coalesced:
+            self.stats["bursts"] += 1
+            self.stats["samples_coalesced"] += coalesced
 
-        # Filtrage par email : si aucun email n'est défini côté intégration -> accepter tout
-        payload_email = self.data[session]["profile"].get("email", "").strip().lower()
-        cfg_email = self.email.lower()
-        if not cfg_email or payload_email == cfg_email:
-            return session
+        for (_, session), (lang, _, route) in latest.items():
+            await self._async_publish_logged(route, session, lang)
 
-        _LOGGER.debug(
-            "Ignoring payload: email %r doesn't match configured %r",
-            payload_email,
-            cfg_email,
-        )
-        return None
+    async def _async_publish_logged(self, route: _Route, session: str, lang: str) -> None:
+        try:
+            await self._async_publish_data(route, session, lang)
+        except Exception as err:
+            _LOGGER.exception("Error publishing Torque session %s: %s", session, err)
+
+    def _request_lang(self, lang: Optional[str], request, default: str = "en") -> str:
+        """Langue de la requête (sans modifier l'état partagé de la vue)."""
+        # 1) ?lang=fr|en ou ?language=fr|en (prioritaire)
+        lang_param = (lang or "").lower()
+        if lang_param in API_LANGS:
+            return lang_param
+
+        # 2) Fallback : Accept-Language (fr en priorité, sinon en)
+        try:
+            al = (request.headers.get("Accept-Language") or "").lower()
+            chosen = None
+            for token in al.split(","):
+                tag = token.split(";")[0].strip()
+                if tag.startswith("fr"):
+                    chosen = "fr"
+                    break
+                if tag.startswith("en") and chosen is None:
+                    chosen = "en"
+            if chosen in API_LANGS:
+                return chosen
+        except Exception:
+            pass
+
+        # 3) Langue configurée pour l'entrée destinataire
+        return default
+
+    def parse_fields(self, qdata, route: _Route):  # noqa
+        """Parse les champs de la requête Torque et remplit le buffer de session.
+
+        `qdata` : query brute (str), mapping déjà décodé, ou _TorqueQuery ;
+        `route` : entrée destinataire (déjà résolue par compte, cf. _resolve_route).
+        """
+        query = qdata if isinstance(qdata, _TorqueQuery) else _parse_query(qdata)
+        session = query.session
+        if not session:
+            raise web.HTTPBadRequest(text="Missing session")
 
-    def _get_field(self, session: str, key: str):
-        # Vérifier que le PID est connu
-        if TORQUE_CODES.get(key) is None:
+        store = route.data
+        sess = store.touch(session)
+
+        # Métadonnées : ré-ingérées seulement si leur empreinte change
+        meta_fp = query.meta_fingerprint
+        if meta_fp is not None and meta_fp != sess.meta_fp:
+            query.decode_meta()
+            if query.shortName:
+                sess.shortName.update(query.shortName)
+            if query.fullName:
+                sess.fullName.update(query.fullName)
+            if query.defaultUnit:
+                sess.defaultUnit.update(query.defaultUnit)
+            sess.meta_fp = meta_fp
+
+        # Échantillon en retard sur l'horloge HA et sur la référence de la session
+        # (cache hors-ligne rejoué, cf. SessionClock) ou plus ancien que le
+        # dernier ingéré (arrivé hors d'ordre) : statistiques, pas état courant
+        received = time.time() if query.received is None else query.received
+        stale = self.backfill is not None and sess.clock.is_stale(
+            query.time, received, route.stale_after
+        )
+        if not stale and query.time and sess.time and query.time < sess.time:
+            self.stats["late_samples"] += 1
+            stale = True
+
+        # Fusion en bloc des sous-dictionnaires (liés une seule fois)
+        if query.value and not stale:
+            sess.value.update(query.value)
+        if query.profile:
+            store.update_profile(sess, query.profile)
+        if query.time is not None and not stale:
+            sess.time = query.time
+        if query.unknown:
+            add_unknown = sess.unknown.add
+            for key, value in query.unknown:
+                add_unknown(key, value)
+
+        if stale:
+            self._route_backfill(route, session, query.time, query.value)
             return None
+        return session
+
+    def _route_backfill(
+        self, route: _Route, session: str, torque_time: Optional[int], values: dict[str, str]
+    ) -> None:
+        """Passe les valeurs (converties) d'un échantillon au backfill de statistiques."""
+        backfill = self.backfill
+        sess = route.data.get(session)
+        if backfill is None or sess is None or not values:
+            return
+        name = sess.profile.get("Name") or route.data.vehicle_name(sess.profile.get("id"))
+        if not name:
+            return
 
-        defaults = TORQUE_CODES[key]
-        # Valeurs brutes
-        name: str = self.data[session]["fullName"].get(key, defaults.get("fullName", key))
-        short_name_raw: str = self.data[session]["shortName"].get(key, defaults.get("shortName", key))
-        unit: str = self.data[session]["defaultUnit"].get(key, defaults.get("unit", ""))
-        value = self.data[session]["value"].get(key)
+        car_id = slugify(name)
+        for key, raw in values.items():
+            defaults = TORQUE_CODES.get(key)
+            if defaults is None:
+                continue
+            desc = self._get_descriptor(
+                key,
+                defaults,
+                sess.shortName.get(key),
+                sess.fullName.get(key),
+                sess.defaultUnit.get(key),
+                route.lang,
+                route.imperial,
+            )
+            value = desc.convert(raw) if desc.convert is not None else raw
+            backfill.add(car_id, desc.short_key, f"{name} {desc.name}", desc.unit, torque_time, value)
+
+    def _get_descriptor(
+        self,
+        key: str,
+        defaults: dict,
+        short_raw: Optional[str],
+        full_raw: Optional[str],
+        unit_raw: Optional[str],
+        lang: str,
+        imperial: bool,
+    ) -> _FieldDescriptor:
+        """Retourne le descripteur du PID, recalculé seulement si ses entrées changent."""
+        cache_key = (key, short_raw, full_raw, unit_raw, lang, imperial)
+        desc = self._field_cache.get(cache_key)
+        if desc is None:
+            desc = self._build_descriptor(key, defaults, short_raw, full_raw, unit_raw, lang, imperial)
+            if len(self._field_cache) >= FIELD_CACHE_MAX_ENTRIES:
+                # Métadonnées très volatiles : on repart de zéro plutôt que de grossir sans fin
+                self._field_cache.clear()
+            self._field_cache[cache_key] = desc
+        return desc
+
+    def _build_descriptor(
+        self,
+        key: str,
+        defaults: dict,
+        short_raw: Optional[str],
+        full_raw: Optional[str],
+        unit_raw: Optional[str],
+        lang: str,
+        imperial: bool,
+    ) -> _FieldDescriptor:
+        """Résout clé normalisée, libellé, unité de sortie et conversion d'un PID."""
+        name: str = full_raw if full_raw is not None else defaults.get("fullName", key)
+        short_name_raw: str = short_raw if short_raw is not None else defaults.get("shortName", key)
+        unit: str = unit_raw if unit_raw is not None else defaults.get("unit", "")
 
         # Clé normalisée pour l’ID & la localisation par clé
         short_key = slugify(str(short_name_raw))  # ex: "engine_rpm"
@@ -499,85 +1149,101 @@ class TorqueReceiveDataView(HomeAssistantView):
             if not unit:
                 unit = "°"
 
-        # Localisation: priorité clé statique -> clé auto -> libellé
-        if self.lang == "fr":
-            name = FR_BY_KEY.get(short_key) or FR_BY_KEY_AUTO.get(short_key) or _localize("fr", name)
+        # Localisation: index de la langue (clé statique -> clé auto) puis libellé
+        labels = _label_index(lang)
+        name = labels.by_key.get(short_key) or (
+            labels.by_name.get(name.casefold(), name) if name else name
+        )
 
-        # Conversion en impérial si demandé
-        if self.imperial and unit in imperial_units and value not in (None, ""):
-            try:
-                conv = _pretty_convert_units(float(value), unit, imperial_units[unit])
-                value = conv["value"]
-                unit = conv["unit"]
-            except (ValueError, TypeError):
-                _LOGGER.debug("Unit conversion skipped for %s=%r %s", key, value, unit)
+        # Conversion en impérial si demandé (unité de sortie résolue une seule fois)
+        convert = None
+        if imperial and unit in imperial_units:
+            target = imperial_units[unit]
+            convert = _make_converter(key, unit, target)
+            unit = _get_converter(unit, target)[1]
 
-        return {
-            "name": name,
-            "short_name": short_key,
-            "unit": unit,
-            "value": value,
-        }
+        return _FieldDescriptor(short_key, name, unit, convert)
 
-    def _cleanup_sessions(self, keep: Optional[str] = None) -> None:
-        """Purge inactive or excess sessions."""
-        try:
-            now = time.time()
-            # 1) TTL purge
-            to_delete = []
-            for key, sess in list(self.data.items()):
-                if keep is not None and key == keep:
-                    continue
-                last_seen = sess.get("last_seen")
-                if last_seen is None or now - float(last_seen) > float(SESSION_TTL_SECONDS):
-                    to_delete.append(key)
-            for key in to_delete:
-                try:
-                    self.data.pop(key, None)
-                except Exception:
-                    pass
-
-            # 2) Cap total sessions
-            if len(self.data) > MAX_SESSIONS:
-                pairs = [(k, v.get("last_seen", 0.0)) for k, v in self.data.items() if k != keep]
-                pairs.sort(key=lambda x: x[1])  # oldest first
-                excess = len(self.data) - MAX_SESSIONS
-                for i in range(excess):
-                    k = pairs[i][0]
-                    self.data.pop(k, None)
-        except Exception as err:
-            _LOGGER.debug("Session cleanup skipped: %s", err)
+    def diagnostics(self, entry_id: str) -> dict:
+        """État interne de la vue pour les diagnostics d'une entrée.
 
-    def _get_profile(self, session: str):
-        return self.data[session]["profile"]
+        Seules la route et les sessions de `entry_id` sont détaillées ; les
+        autres sections ne contiennent que des compteurs globaux.
+        """
+        route = next((r for r in self.routes.values() if r.entry_id == entry_id), None)
+        return {
+            "route": route.diagnostics() if route is not None else None,
+            "routes_by_id": sum(1 for r in self._routes_by_id.values() if r is route),
+            "rejected": dict(self.rejected),
+            "sessions": route.data.diagnostics() if route is not None else None,
+            "ingest": {**self.queue.diagnostics(), "burst": dict(self.stats)},
+            "dedup": self.recent.diagnostics(),
+            "reorder": self.reorder.diagnostics(),
+            "throttle": self.throttle.diagnostics(),
+            "backfill": self.backfill.diagnostics() if self.backfill is not None else None,
+        }
 
-    def _get_data(self, session: str):
-        retdata = {"profile": self._get_profile(session), "time": self.data[session]["time"]}
+    def _get_layout(self, route: _Route, session: str, lang: str) -> _SessionLayout:
+        """Layout (PID -> clé/descripteur) de la session, recalculé si le schéma change."""
+        sess = route.data[session]
+        # Schéma = empreinte des métadonnées + ensemble des PIDs (qui ne fait que croître)
+        schema = (sess.meta_fp, len(sess.value), lang, route.imperial)
+        layout = sess.layout
+        if layout is not None and layout.schema == schema:
+            return layout
+
+        # Méta figées ; entrées inchangées reprises du layout précédent (partage structurel)
+        prev_meta = layout.meta if layout is not None else {}
+        fields = []
         meta = {}
-
-        for key in self.data[session]["value"].keys():
-            row_data = self._get_field(session, key)
-            if row_data is None:
+        used = {"profile", "time", "meta"}
+        for key in sess.value.keys():
+            defaults = TORQUE_CODES.get(key)
+            if defaults is None:
                 continue
-
-            short = row_data["short_name"]
+            desc = self._get_descriptor(
+                key,
+                defaults,
+                sess.shortName.get(key),
+                sess.fullName.get(key),
+                sess.defaultUnit.get(key),
+                lang,
+                route.imperial,
+            )
+
+            short = desc.short_key
             # Évite d'écraser un autre PID ayant le même short_name
-            if short in retdata:
+            if short in used:
                 short = f"{short}-{key}"
-
-            retdata[short] = row_data["value"]
-            meta[short] = {"name": row_data["name"], "unit": row_data["unit"]}
-
-        retdata["meta"] = meta
-        return retdata
-
-    async def _async_publish_data(self, session: str):
+            used.add(short)
+
+            fields.append((key, short, desc))
+            entry = prev_meta.get(short)
+            if entry is None or entry["name"] != desc.name or entry["unit"] != desc.unit:
+                entry = MappingProxyType({"name": desc.name, "unit": desc.unit})
+            meta[short] = entry
+
+        layout = sess.layout = _SessionLayout(schema, tuple(fields), MappingProxyType(meta))
+        return layout
+
+    @staticmethod
+    def _iter_values(sess: SessionRecord, layout: _SessionLayout) -> Iterator[tuple[str, Any]]:
+        """Couples (clé publiée, valeur convertie) de la session, sans dict intermédiaire."""
+        values = sess.value
+        for key, short, desc in layout.fields:
+            value = values.get(key)
+            if desc.convert is not None:
+                value = desc.convert(value)
+            yield short, value
+
+    async def _async_publish_data(self, route: _Route, session: str, lang: Optional[str] = None):
         # --- GARDE ANTI-STALE : ignorer si l'entrée n'est pas chargée ---
-        if not getattr(self, "coordinator", None):
-            _LOGGER.warning("No coordinator bound to view; dropping payload")
+        coordinator = route.coordinator
+        if self.routes.get(route.email) is not route:
+            _LOGGER.debug("Config entry %s no longer routed; dropping payload", route.entry_id)
             return
 
-        entry = getattr(self.coordinator, "config_entry", None) or getattr(self.coordinator, "entry", None)
+        entry = getattr(coordinator, "config_entry", None) or getattr(coordinator, "entry", None)
         if entry is None:
             _LOGGER.warning("Missing config entry on coordinator; dropping payload")
             return
@@ -587,22 +1253,21 @@ class TorqueReceiveDataView(HomeAssistantView):
             return
         # -----------------------------------------------------------------
 
-        session_data = self._get_data(session)
+        store = route.data
+        sess = store[session]
+        layout = self._get_layout(route, session, lang or route.lang)
 
         # Ne publie pas tant qu'on n'a pas le nom du véhicule
-        if "Name" not in session_data["profile"]:
-            current_id = session_data["profile"].get("id")
-            other_sessions = [
-                self.data[key]
-                for key in self.data.keys()
-                if self.data[key]["profile"].get("id") == current_id
-                and "Name" in self.data[key]["profile"]
-            ]
-            if not other_sessions:
+        if "Name" not in sess.profile:
+            name = store.vehicle_name(sess.profile.get("id"))
+            if not name:
                 _LOGGER.warning("Missing profile name from torque data.")
                 return
-            session_data["profile"]["Name"] = other_sessions[0]["profile"]["Name"]
+            store.update_profile(sess, {"Name": name})
 
-        # Mémorise par voiture et notifie les entités
-        self.coordinator.update_from_session(session_data)
-        await self.coordinator.add_entities(session_data)
+        # Nouvelle version de la voiture (valeurs inchangées et méta réutilisées)
+        # (découverte d'entités sautée tant que le schéma de la session ne change pas)
+        snapshot = coordinator.publish(
+            sess.profile, sess.time, layout.meta, self._iter_values(sess, layout)
+        )
+        await coordinator.add_entities(snapshot, schema=layout.schema)
@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""Backfill of delayed Torque samples into long-term statistics."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Optional
+import logging
+import math
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import (
+    DOMAIN,
+    BACKFILL_BUCKET_SECONDS,
+    BACKFILL_MAX_BUCKETS,
+    BACKFILL_MAX_IMPORTED_HOURS,
+    SESSION_CLOCK_STEADY_SECONDS,
+    SESSION_CLOCK_STEADY_TOLERANCE,
+)
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+_HOUR = 3600
+
+
+def torque_timestamp(value: Optional[int]) -> Optional[float]:
+    """Horodatage Torque en secondes epoch (Torque envoie des millisecondes)."""
+    if not value:
+        return None
+    return value / 1000.0 if value > 100_000_000_000 else float(value)
+
+
+class SessionClock:
+    """Décalage entre l'horloge du téléphone et celle de HA, pour une session.
+
+    Le décalage d'un échantillon est `reçu à (HA) - time (téléphone)` : il
+    mêle l'écart des horloges et la latence d'envoi. Un échantillon est en
+    retard (cache rejoué) si ce décalage dépasse `stale_after` sur l'horloge
+    HA et sur la référence de la session.
+
+    La référence n'est retenue qu'après une série de décalages stables (à
+    `SESSION_CLOCK_STEADY_TOLERANCE` près) pendant `SESSION_CLOCK_STEADY_SECONDS`
+    de réception : c'est le cas d'un téléphone en avance ou en retard qui
+    envoie en direct, ou dont l'horloge a été recalée. Un cache rejoué, même
+    dans l'ordre chronologique, voit son décalage diminuer à chaque échantillon
+    et ne fixe donc pas de référence.
+    """
+
+    __slots__ = ("offset", "run_since", "run_min", "run_max")
+
+    def __init__(self) -> None:
+        self.offset: Optional[float] = None
+        # Série de décalages stables en cours : début (réception), bornes
+        self.run_since: Optional[float] = None
+        self.run_min: float = 0.0
+        self.run_max: float = 0.0
+
+    def is_stale(self, torque_time: Optional[int], received: float, stale_after: float) -> bool:
+        """True si l'échantillon est trop en retard pour devenir l'état courant."""
+        ts = torque_timestamp(torque_time)
+        if ts is None:
+            return False
+        offset = received - ts
+        self._track(offset, received)
+        if offset <= stale_after:
+            return False
+        return self.offset is None or offset > self.offset + stale_after
+
+    def _track(self, offset: float, received: float) -> None:
+        """Suit la série de décalages stables ; fixe la référence une fois confirmée."""
+        low, high = min(self.run_min, offset), max(self.run_max, offset)
+        if self.run_since is None or high - low > SESSION_CLOCK_STEADY_TOLERANCE:
+            self.run_since, self.run_min, self.run_max = received, offset, offset
+            return
+        self.run_min, self.run_max = low, high
+        if received - self.run_since >= SESSION_CLOCK_STEADY_SECONDS:
+            self.offset = low
+
+
+class StatisticsBackfill:
+    """Agrège les échantillons en retard et les importe en statistiques externes.
+
+    Les échantillons en retard (cache hors-ligne rejoué, cf. SessionClock) ne
+    deviennent pas des états courants : ils sont agrégés en seaux de
+    `BACKFILL_BUCKET_SECONDS` (count/sum/min/max) puis importés en bloc via
+    `async_add_external_statistics` (id `torque_logger_2025:<car>_<clé>`).
+
+    Le recorder n'accepte que des statistiques horaires : les seaux sont
+    regroupés par heure à l'import, et les heures déjà importées sont gardées
+    (bornées) pour fusionner les échantillons arrivés plus tard.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        bucket_seconds: int = BACKFILL_BUCKET_SECONDS,
+        max_buckets: int = BACKFILL_MAX_BUCKETS,
+    ) -> None:
+        self.hass = hass
+        self.bucket_seconds = int(bucket_seconds)
+        self.max_buckets = max_buckets
+        # (car_id, clé) -> {début du seau -> [count, sum, min, max]}
+        self._buckets: dict[tuple[str, str], dict[int, list[float]]] = {}
+        self._pending = 0
+        # (car_id, clé) -> (nom affiché, unité)
+        self._meta: dict[tuple[str, str], tuple[str, Optional[str]]] = {}
+        # ((car_id, clé), heure) -> [count, sum, min, max] déjà importé
+        self._imported: OrderedDict[tuple[tuple[str, str], int], list[float]] = OrderedDict()
+        self.stats: dict[str, int] = {
+            "samples": 0,
+            "dropped": 0,
+            "imports": 0,
+            "hours_imported": 0,
+            "import_errors": 0,
+        }
+
+    def add(
+        self,
+        car_id: str,
+        key: str,
+        name: str,
+        unit: Optional[str],
+        torque_time: Optional[int],
+        value: Any,
+    ) -> bool:
+        """Ajoute un échantillon numérique à son seau ; False s'il est ignoré."""
+        ts = torque_timestamp(torque_time)
+        if ts is None:
+            return False
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return False
+        if not math.isfinite(value):
+            return False
+
+        stat = (car_id, key)
+        buckets = self._buckets.setdefault(stat, {})
+        start = int(ts) - int(ts) % self.bucket_seconds
+        bucket = buckets.get(start)
+        if bucket is None:
+            if self._pending >= self.max_buckets:
+                self.stats["dropped"] += 1
+                return False
+            buckets[start] = [1, value, value, value]
+            self._pending += 1
+        else:
+            bucket[0] += 1
+            bucket[1] += value
+            if value < bucket[2]:
+                bucket[2] = value
+            if value > bucket[3]:
+                bucket[3] = value
+        self._meta[stat] = (name, unit or None)
+        self.stats["samples"] += 1
+        return True
+
+    def _hourly(self, stat: tuple[str, str], buckets: dict[int, list[float]]) -> dict[int, list[float]]:
+        """Regroupe les seaux par heure, fusionnés avec ce qui a déjà été importé."""
+        hours: dict[int, list[float]] = {}
+        for start, (count, total, vmin, vmax) in buckets.items():
+            hour = start - start % _HOUR
+            agg = hours.get(hour)
+            if agg is None:
+                prev = self._imported.get((stat, hour))
+                agg = hours[hour] = list(prev) if prev is not None else [0, 0.0, vmin, vmax]
+            agg[0] += count
+            agg[1] += total
+            agg[2] = min(agg[2], vmin)
+            agg[3] = max(agg[3], vmax)
+        return hours
+
+    def _remember(self, stat: tuple[str, str], hour: int, agg: list[float]) -> None:
+        self._imported[(stat, hour)] = agg
+        self._imported.move_to_end((stat, hour))
+        while len(self._imported) > BACKFILL_MAX_IMPORTED_HOURS:
+            self._imported.popitem(last=False)
+
+    @callback
+    def async_flush(self, _now: Any = None) -> int:
+        """Importe les seaux en attente dans le recorder ; retourne le nb d'heures importées."""
+        if not self._pending:
+            return 0
+        if "recorder" not in self.hass.config.components:
+            return 0
+
+        from homeassistant.components.recorder.statistics import (
+            async_add_external_statistics,
+        )
+        try:  # HA >= 2025.4 : type de moyenne explicite
+            from homeassistant.components.recorder.models import StatisticMeanType
+        except ImportError:
+            StatisticMeanType = None
+
+        imported = 0
+        for stat, stat_buckets in list(self._buckets.items()):
+            car_id, key = stat
+            name, unit = self._meta.get(stat, (key, None))
+            hours = self._hourly(stat, stat_buckets)
+            statistics = []
+            for hour in sorted(hours):
+                count, total, vmin, vmax = hours[hour]
+                statistics.append(
+                    {
+                        "start": dt_util.utc_from_timestamp(hour),
+                        "mean": total / count,
+                        "min": vmin,
+                        "max": vmax,
+                    }
+                )
+
+            metadata = {
+                "has_mean": True,
+                "has_sum": False,
+                "name": name,
+                "source": DOMAIN,
+                "statistic_id": f"{DOMAIN}:{slugify(f'{car_id}_{key}')}",
+                "unit_of_measurement": unit,
+            }
+            if StatisticMeanType is not None:
+                metadata["mean_type"] = StatisticMeanType.ARITHMETIC
+            try:
+                async_add_external_statistics(self.hass, metadata, statistics)
+            except Exception as err:
+                # Seaux conservés : nouvel essai au prochain flush
+                self.stats["import_errors"] += 1
+                _LOGGER.warning(
+                    "Statistics backfill failed for %s (%d buckets kept for retry): %s",
+                    metadata["statistic_id"],
+                    len(stat_buckets),
+                    err,
+                )
+                continue
+            del self._buckets[stat]
+            self._pending -= len(stat_buckets)
+            for hour, agg in hours.items():
+                self._remember(stat, hour, agg)
+            imported += len(statistics)
+
+        if imported:
+            self.stats["imports"] += 1
+            self.stats["hours_imported"] += imported
+            _LOGGER.debug("Backfilled %d hourly statistics from delayed Torque samples", imported)
+        return imported
+
+    def diagnostics(self) -> dict[str, Any]:
+        return {
+            "bucket_seconds": self.bucket_seconds,
+            "pending_buckets": self._pending,
+            "statistics": len(self._meta),
+            "stats": dict(self.stats),
+        }
@@ -21,7 +21,29 @@ from .const import (
     CONF_LANGUAGE,
     DEFAULT_LANGUAGE,
     SUPPORTED_LANGS,  # e.g. ("en","fr","fr-CA","en-GB",...)
+    CONF_DEADBAND,
+    CONF_DEADBAND_ABSOLUTE,
+    CONF_DEADBAND_PERCENT,
+    CONF_MIN_INTERVAL,
+    CONF_MAX_AGE,
+    DEFAULT_DEADBAND,
+    DEFAULT_DEADBAND_ABSOLUTE,
+    DEFAULT_DEADBAND_PERCENT,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MAX_AGE,
+    CONF_QUEUE_POLICY,
+    DEFAULT_QUEUE_POLICY,
+    QUEUE_POLICIES,
+    CONF_REORDER_WINDOW,
+    DEFAULT_REORDER_WINDOW,
+    CONF_RATE_LIMIT,
+    CONF_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_BURST,
+    CONF_STALE_AFTER,
+    BACKFILL_STALE_SECONDS,
 )
+from .values import parse_unit_thresholds
 
 
 def _codes_from_supported_langs(supported) -> list[str]:
@@ -55,14 +77,10 @@ _LANG_LABELS = {
 
 class TorqueLoggerFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     """Config flow for Torque Logger 2025."""
-    VERSION = 1
+    VERSION = 3
 
     async def async_step_user(self, user_input: dict | None = None):
         """Handle the initial step."""
-        # Une seule instance
-        await self.async_set_unique_id(DOMAIN)
-        self._abort_if_unique_id_configured()
-
         # Construit les options de langue
         codes = _codes_from_supported_langs(SUPPORTED_LANGS)
         lang_options = [{"label": _LANG_LABELS.get(c, c), "value": c} for c in codes]
@@ -81,12 +99,15 @@ class TorqueLoggerFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "invalid_email"
 
             if not errors:
+                # Une entrée par compte Torque (les uploads sont routés par email)
+                await self.async_set_unique_id(email.lower())
+                self._abort_if_unique_id_configured()
                 data = {
                     CONF_EMAIL: email,
                     CONF_IMPERIAL: imperial,
                     CONF_LANGUAGE: language if language in codes else DEFAULT_LANGUAGE,
                 }
-                return self.async_create_entry(title=NAME, data=data)
+                return self.async_create_entry(title=f"{NAME} ({email})", data=data)
 
         data_schema = vol.Schema(
             {
@@ -118,11 +139,18 @@ class TorqueLoggerOptionsFlowHandler(config_entries.OptionsFlow):
         codes = _codes_from_supported_langs(SUPPORTED_LANGS)
         lang_options = [{"label": _LANG_LABELS.get(c, c), "value": c} for c in codes]
 
+        errors: dict[str, str] = {}
         if user_input is not None:
-            # On enregistre tel quel : Home Assistant gère le merge options/data
-            lang = user_input.get(CONF_LANGUAGE, DEFAULT_LANGUAGE)
-            user_input[CONF_LANGUAGE] = lang if lang in codes else DEFAULT_LANGUAGE
-            return self.async_create_entry(title="", data=user_input)
+            # Seuils absolus par unité : "°C=0.5; rpm=50"
+            try:
+                parse_unit_thresholds(user_input.get(CONF_DEADBAND_ABSOLUTE, DEFAULT_DEADBAND_ABSOLUTE))
+            except ValueError:
+                errors[CONF_DEADBAND_ABSOLUTE] = "invalid_deadband"
+            if not errors:
+                # On enregistre tel quel : Home Assistant gère le merge options/data
+                lang = user_input.get(CONF_LANGUAGE, DEFAULT_LANGUAGE)
+                user_input[CONF_LANGUAGE] = lang if lang in codes else DEFAULT_LANGUAGE
+                return self.async_create_entry(title="", data=user_input)
 
         current_imperial = self.config_entry.options.get(
             CONF_IMPERIAL, self.config_entry.data.get(CONF_IMPERIAL, False)
@@ -132,6 +160,11 @@ class TorqueLoggerOptionsFlowHandler(config_entries.OptionsFlow):
         )
         if current_language not in codes:
             current_language = DEFAULT_LANGUAGE
+        options = self.config_entry.options
+        # Ancienne option numérique globale : plus prise en compte
+        current_absolute = options.get(CONF_DEADBAND_ABSOLUTE, DEFAULT_DEADBAND_ABSOLUTE)
+        if not isinstance(current_absolute, str):
+            current_absolute = DEFAULT_DEADBAND_ABSOLUTE
 
         data_schema = vol.Schema(
             {
@@ -142,6 +175,50 @@ class TorqueLoggerOptionsFlowHandler(config_entries.OptionsFlow):
                         mode=SelectSelectorMode.DROPDOWN,
                     )
                 ),
+                # Filtrage des écritures d'état (seuils par unité, voir DEADBAND_DEFAULTS)
+                vol.Optional(
+                    CONF_DEADBAND, default=options.get(CONF_DEADBAND, DEFAULT_DEADBAND)
+                ): bool,
+                vol.Optional(CONF_DEADBAND_ABSOLUTE, default=current_absolute): str,
+                vol.Optional(
+                    CONF_DEADBAND_PERCENT,
+                    default=options.get(CONF_DEADBAND_PERCENT, DEFAULT_DEADBAND_PERCENT),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                vol.Optional(
+                    CONF_MIN_INTERVAL,
+                    default=options.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                vol.Optional(
+                    CONF_MAX_AGE, default=options.get(CONF_MAX_AGE, DEFAULT_MAX_AGE)
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=86400)),
+                # File d'ingestion pleine : abandon du plus ancien ou fusion par véhicule
+                vol.Optional(
+                    CONF_QUEUE_POLICY,
+                    default=options.get(CONF_QUEUE_POLICY, DEFAULT_QUEUE_POLICY),
+                ): SelectSelector(
+                    SelectSelectorConfig(
+                        options=list(QUEUE_POLICIES),
+                        mode=SelectSelectorMode.DROPDOWN,
+                        translation_key=CONF_QUEUE_POLICY,
+                    )
+                ),
+                # Fenêtre de réordonnancement des uploads (0 = désactivée)
+                vol.Optional(
+                    CONF_REORDER_WINDOW,
+                    default=options.get(CONF_REORDER_WINDOW, DEFAULT_REORDER_WINDOW),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=30)),
+                vol.Optional(
+                    CONF_RATE_LIMIT,
+                    default=options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=20)),
+                vol.Optional(
+                    CONF_RATE_BURST,
+                    default=options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+                vol.Optional(
+                    CONF_STALE_AFTER,
+                    default=options.get(CONF_STALE_AFTER, BACKFILL_STALE_SECONDS),
+                ): vol.All(vol.Coerce(float), vol.Range(min=30, max=86400)),
             }
         )
-        return self.async_show_form(step_id="init", data_schema=data_schema)
+        return self.async_show_form(step_id="init", data_schema=data_schema, errors=errors)
@@ -4,20 +4,10 @@ from __future__ import annotations
 
 # Base component constants
 from typing import Final
-import json
-import os
 
 NAME: Final = "Torque Logger 2025"
 DOMAIN: Final = "torque_logger_2025"
 
-# Lecture sécurisée de la version depuis manifest.json
-_manifest = os.path.join(os.path.dirname(__file__), "manifest.json")
-try:
-    with open(_manifest, encoding="utf-8") as file:
-        VERSION: Final = json.load(file).get("version", "0.0.0")
-except Exception:
-    VERSION: Final = "0.0.0"
-
 ATTRIBUTION: Final = "Torque Pro 2025"
 ISSUE_URL: Final = "https://github.com/Marlboro62/homeassistant/issues"
 
@@ -85,24 +75,153 @@ SESSION_TTL_SECONDS: Final = 30 * 60
 # Keep at most this many recent sessions (evicts oldest by last_seen)
 MAX_SESSIONS: Final = 100
 
+# Period of the background TTL purge
+SESSION_PURGE_INTERVAL_SECONDS: Final = 60
+
+# File d'ingestion (la vue répond à Torque avant traitement)
+CONF_QUEUE_POLICY: Final = "queue_policy"
+QUEUE_POLICY_DROP_OLDEST: Final = "drop_oldest"
+QUEUE_POLICY_COALESCE: Final = "coalesce"
+QUEUE_POLICIES: Final = (QUEUE_POLICY_COALESCE, QUEUE_POLICY_DROP_OLDEST)
+DEFAULT_QUEUE_POLICY: Final = QUEUE_POLICY_COALESCE
+INGEST_QUEUE_MAXSIZE: Final = 256
+INGEST_BATCH_SIZE: Final = 32
+# Retard d'ingestion (mode rafale) : uploads en attente (lot + file) ou attente (s)
+# du plus ancien upload du lot au-delà desquels les échantillons intermédiaires sont fusionnés
+INGEST_BACKLOG_DEPTH: Final = 8
+INGEST_BACKLOG_SECONDS: Final = 5
+
+# Backfill : échantillons en retard de plus de `stale_after` s sur l'horloge HA
+# et sur leur session (cache hors-ligne rejoué) -> statistiques externes au lieu d'états courants
+CONF_STALE_AFTER: Final = "stale_after"
+BACKFILL_STALE_SECONDS: Final = 5 * 60
+# Décalage d'horloge d'une session retenu s'il reste stable (à la tolérance près)
+# pendant ce temps de réception (un rejeu de cache dérive, un envoi en direct non)
+SESSION_CLOCK_STEADY_SECONDS: Final = 10
+SESSION_CLOCK_STEADY_TOLERANCE: Final = 5
+BACKFILL_BUCKET_SECONDS: Final = 5 * 60
+BACKFILL_FLUSH_INTERVAL_SECONDS: Final = 60
+BACKFILL_MAX_BUCKETS: Final = 20000
+BACKFILL_MAX_IMPORTED_HOURS: Final = 2000
+
+# Fenêtre de réordonnancement des uploads (watermark sur `time`, en s ; 0 = désactivée)
+CONF_REORDER_WINDOW: Final = "reorder_window"
+DEFAULT_REORDER_WINDOW: Final = 2.0
+REORDER_MAX_PENDING: Final = 64
+
+# Limitation de débit par source (token bucket, uploads/s ; 0 = désactivée) :
+# les uploads en excès sont fusionnés dans le dernier reçu, pas perdus
+CONF_RATE_LIMIT: Final = "rate_limit"
+CONF_RATE_BURST: Final = "rate_burst"
+DEFAULT_RATE_LIMIT: Final = 1.0
+DEFAULT_RATE_BURST: Final = 5
+RATE_LIMIT_MAX_SOURCES: Final = 1024
+
+# Anti-doublons : derniers uploads (time + query) mémorisés par session
+DEDUP_WINDOW: Final = 32
+
+# Routage multi-comptes : ids Torque appris (id -> entrée) conservés au plus
+ROUTE_ID_CACHE_MAX: Final = 1024
+
+# Motifs de rejet du pré-contrôle (compteurs exposés via diagnostics)
+REJECT_MISSING_SESSION: Final = "missing_session"
+REJECT_NO_ENTRY: Final = "no_entry"
+REJECT_ENTRY_NOT_LOADED: Final = "entry_not_loaded"
+REJECT_MISSING_ACCOUNT: Final = "missing_account"
+REJECT_UNKNOWN_ACCOUNT: Final = "unknown_account"
+REJECT_REASONS: Final = (
+    REJECT_MISSING_SESSION,
+    REJECT_NO_ENTRY,
+    REJECT_ENTRY_NOT_LOADED,
+    REJECT_MISSING_ACCOUNT,
+    REJECT_UNKNOWN_ACCOUNT,
+)
+
+# Clés de query inconnues mémorisées par session (distinctes, LRU) et longueurs max
+# de la clé et de la dernière valeur conservées
+MAX_UNKNOWN_KEYS: Final = 64
+UNKNOWN_VALUE_MAX_LEN: Final = 64
+UNKNOWN_KEY_MAX_LEN: Final = 64
+
+# Création d'entités : ajouts regroupés par voiture sur cette fenêtre (s)
+ENTITY_DISCOVERY_DEBOUNCE_SECONDS: Final = 1.0
+
+# Cache des descripteurs de PID (résolution nom/unité/conversion)
+FIELD_CACHE_MAX_ENTRIES: Final = 4096
+
+# Filtrage des écritures d'état des capteurs (deadband / intervalle minimal / âge max)
+CONF_DEADBAND: Final = "deadband"                    # active le filtrage par seuil
+CONF_DEADBAND_ABSOLUTE: Final = "deadband_absolute"  # seuils absolus par unité ("°C=0.5; rpm=50"), vide = défauts
+CONF_DEADBAND_PERCENT: Final = "deadband_percent"    # seuil relatif (%), 0 = défauts par unité
+CONF_MIN_INTERVAL: Final = "min_interval"            # s entre deux écritures
+CONF_MAX_AGE: Final = "max_age"                      # s avant écriture forcée
+
+DEFAULT_DEADBAND: Final = True
+DEFAULT_DEADBAND_ABSOLUTE: Final = ""
+DEFAULT_DEADBAND_PERCENT: Final = 0.0
+DEFAULT_MIN_INTERVAL: Final = 0
+DEFAULT_MAX_AGE: Final = 300
+
+# Seuils par défaut par unité (TORQUE_CODES) : unité -> (absolu, relatif %)
+# Une variation est écrite dès qu'elle dépasse l'un des deux seuils (relatif : 0 = ignoré).
+DEADBAND_DEFAULTS: Final = {
+    "%": (0.5, 0.0),
+    "°C": (0.2, 0.0),
+    "°F": (0.5, 0.0),
+    "°": (2.0, 0.0),
+    "kPa": (0.5, 0.0),
+    "hPa": (0.5, 0.0),
+    "Pa": (5.0, 0.0),
+    "psi": (0.1, 0.0),
+    "V": (0.02, 0.0),
+    "mA": (0.1, 0.0),
+    "A": (0.1, 0.0),
+    "W": (10.0, 0.0),
+    "kW": (0.5, 0.0),
+    "hp": (0.5, 0.0),
+    "Nm": (1.0, 0.0),
+    "ft-lb": (1.0, 0.0),
+    "λ": (0.005, 0.0),
+    "rpm": (25.0, 0.0),
+    "km/h": (0.5, 0.0),
+    "mph": (0.3, 0.0),
+    "m/s²": (0.05, 0.0),
+    "km": (0.1, 0.0),
+    "mi": (0.05, 0.0),
+    "m": (1.0, 0.0),
+    "ft": (3.0, 0.0),
+    "s": (1.0, 0.0),
+    "g/s": (0.2, 0.0),
+    "L/min": (0.05, 0.0),
+    "L/h": (0.05, 0.0),
+    "ppm": (5.0, 0.0),
+    "L/100km": (0.0, 1.0),
+    "km/L": (0.0, 1.0),
+    "mpg": (0.0, 1.0),
+}
+# Unités non listées : seules les valeurs identiques sont filtrées
+DEADBAND_FALLBACK: Final = (0.0, 0.0)
+
 
 # Platforms
 DEVICE_TRACKER: Final = "device_tracker"
 SENSOR: Final = "sensor"
 PLATFORMS: Final = [SENSOR, DEVICE_TRACKER]
 
+# La version est fournie à l'exécution (manifest déjà chargé par HA) :
+# STARTUP_MESSAGE.format(version=...)
 STARTUP_MESSAGE = f"""
 -------------------------------------------------------------------
 FR:
 {NAME}
-Version: {VERSION}
+Version: {{version}}
 Il s'agit d'une intégration personnalisée !
 Si vous rencontrez des problèmes, vous pouvez ouvrir un ticket ici :
 {ISSUE_URL}
 -------------------------------------------------------------------
 EN:
 {NAME}
-Version: {VERSION}
+Version: {{version}}
 This is a custom integration!
 If you have any issues with this you need to open an issue here:
 {ISSUE_URL}
@@ -3,24 +3,87 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Optional
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Mapping, Optional
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_call_later
 from homeassistant.util import slugify
 
 from .sensor import TorqueSensor
 from .device_tracker import TorqueDeviceTracker
-from .const import DOMAIN, ENTITY_GPS, TORQUE_GPS_LAT, TORQUE_GPS_LON
+from .values import CarSnapshot, CarValues
+from .const import (
+    ATTR_SPEED,
+    DOMAIN,
+    ENTITY_GPS,
+    ENTITY_DISCOVERY_DEBOUNCE_SECONDS,
+    TORQUE_GPS_ACCURACY,
+    TORQUE_GPS_ALTITUDE,
+    TORQUE_GPS_LAT,
+    TORQUE_GPS_LON,
+)
 
 if TYPE_CHECKING:
     from .api import TorqueReceiveDataView
 
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
+# Entités dont l'état dépend d'autres clés que leur propre sensor_key
+_ENTITY_DEPENDENCIES: dict[str, tuple[str, ...]] = {
+    ENTITY_GPS: (
+        TORQUE_GPS_LAT,
+        TORQUE_GPS_LON,
+        TORQUE_GPS_ACCURACY,
+        TORQUE_GPS_ALTITUDE,
+        ATTR_SPEED,
+        "time",
+    ),
+}
+
+
+class _VehicleListeners:
+    """Écouteurs des entités d'une voiture, par sensor_key.
+
+    Une publication ne parcourt que le groupe de sa voiture : son coût suit le
+    nombre d'entités du véhicule, pas celui de la flotte.
+    """
+
+    __slots__ = ("by_key",)
+
+    def __init__(self) -> None:
+        self.by_key: dict[str, list[CALLBACK_TYPE]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(cbs) for cbs in self.by_key.values())
+
+    def add(self, key: str, update_callback: CALLBACK_TYPE) -> Callable[[], None]:
+        listeners = self.by_key.setdefault(key, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            if update_callback in listeners:
+                listeners.remove(update_callback)
+            if not listeners and self.by_key.get(key) is listeners:
+                del self.by_key[key]
+
+        return remove_listener
+
+    def notify(self, changed: Optional[set[str]]) -> None:
+        """Réveille les écouteurs des clés modifiées (toutes si `changed` est None)."""
+        if changed is None:
+            targets = list(self.by_key.values())
+        else:
+            targets = [cbs for key in changed if (cbs := self.by_key.get(key))]
+        for cbs in targets:
+            for update_callback in list(cbs):
+                update_callback()
+
 
 class TorqueLoggerCoordinator(DataUpdateCoordinator):
     """Gère l’état et la création des entités Torque."""
@@ -38,36 +101,139 @@ class TorqueLoggerCoordinator(DataUpdateCoordinator):
         super().__init__(hass, _LOGGER, name=DOMAIN)
         self.api = client
         self.entry = entry
-        client.coordinator = self
 
         # Capteurs déjà créés (par voiture) via clef "car_id:sensor_key"
         self.tracked: set[str] = set()
-        # Dernières données reçues par voiture (car_id -> session_data)
-        self.cars: dict[str, dict] = {}
+        # Dernier état publié par voiture (car_id -> CarSnapshot immuable et versionné)
+        self.cars: dict[str, CarSnapshot] = {}
+        # Dernières valeurs par voiture, parsées une fois (car_id -> CarValues)
+        self.values: dict[str, CarValues] = {}
+        # Schéma de session déjà entièrement découvert par voiture (car_id -> schéma)
+        self._discovered: dict[str, tuple] = {}
+        # Écouteurs d'entités : un groupe par voiture (car_id -> sensor_key -> callbacks)
+        self._vehicles: dict[str, _VehicleListeners] = {}
+        # Découverte : DeviceInfo par voiture, clés écartées (-> méta évaluées),
+        # entités en attente d'ajout groupé et minuteries de debounce
+        self._devices: dict[str, tuple[tuple, DeviceInfo]] = {}
+        self._rejected: dict[str, dict[str, dict]] = {}
+        self._pending_sensors: dict[str, dict[str, TorqueSensor]] = {}
+        self._pending_trackers: dict[str, TorqueDeviceTracker] = {}
+        self._flush_unsub: dict[str, CALLBACK_TYPE] = {}
+        self.stats: dict[str, int] = {"add_calls": 0, "entities_added": 0}
 
     async def _async_update_data(self):
         """Aucune mise à jour planifiée : on est en push uniquement."""
         return None
 
     # --------- Lecture de données ----------
-    def get_value(self, car_id: str, key: str):
-        data = self.cars.get(car_id)
-        if not data:
+    def get_float(self, car_id: str, key: str) -> Optional[float]:
+        store = self.values.get(car_id)
+        if store is None:
             return None
-        return data.get(key)
+        return store.get_float(key)
 
-    def get_meta(self, car_id: str) -> dict:
-        data = self.cars.get(car_id)
-        if not data:
+    def get_meta(self, car_id: str) -> Mapping[str, Mapping[str, str]]:
+        snapshot = self.cars.get(car_id)
+        if snapshot is None:
             return {}
-        return data.get("meta", {})
+        return snapshot.meta
+
+    def get_version(self, car_id: str, key: str) -> int:
+        """Version de la dernière modification de la clé (0 si inconnue)."""
+        store = self.values.get(car_id)
+        if store is None:
+            return 0
+        return store.version_of(key)
+
+    # --------- Écouteurs par (car_id, sensor_key) ----------
+    def _vehicle_listeners(self, car_id: str) -> _VehicleListeners:
+        """Groupe d'écouteurs de la voiture, créé à sa première apparition."""
+        group = self._vehicles.get(car_id)
+        if group is None:
+            group = self._vehicles[car_id] = _VehicleListeners()
+        return group
+
+    def listener_counts(self) -> dict[str, int]:
+        """Nombre d'écouteurs d'entités par voiture (diagnostics)."""
+        return {car_id: len(group) for car_id, group in self._vehicles.items()}
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Enregistre un écouteur ; rangé dans le groupe de sa voiture pour les entités Torque."""
+        if not isinstance(context, tuple):
+            return super().async_add_listener(update_callback, context)
+
+        car_id, key = context
+        return self._vehicle_listeners(car_id).add(key, update_callback)
+
+    @staticmethod
+    def _meta_changes(
+        previous: Mapping[str, Mapping[str, str]], current: Mapping[str, Mapping[str, str]]
+    ) -> set[str]:
+        """Clés dont les méta (nom/unité) ont changé."""
+        if previous is current:
+            return set()
+        return {key for key, m in current.items() if previous.get(key) != m}
+
+    @callback
+    def _async_notify_entities(self, car_id: str, changed: Optional[Iterable[str]]) -> None:
+        """Réveille uniquement les entités de la voiture dont les données ont changé."""
+        group = self._vehicles.get(car_id)
+        if group is None:
+            return
+        if changed is not None:
+            changed = set(changed)
+            for key, deps in _ENTITY_DEPENDENCIES.items():
+                if not changed.isdisjoint(deps):
+                    changed.add(key)
+        group.notify(changed)
 
     # --------- Réception depuis l’API ----------
-    def update_from_session(self, session_data: dict) -> None:
-        """Appelé par l’API quand un nouveau payload est parsé."""
-        car_id = slugify(session_data["profile"]["Name"])
-        self.cars[car_id] = session_data
-        self.async_set_updated_data(session_data)
+    def publish(
+        self,
+        profile: Mapping[str, str],
+        time: int,
+        meta: Mapping[str, Mapping[str, str]],
+        items: Iterable[tuple[str, Any]],
+    ) -> CarSnapshot:
+        """Publie un payload parsé : nouvelle version de la voiture si quelque chose a changé.
+
+        `profile` est copié (figé) seulement s'il diffère de la version précédente ;
+        `meta` (figé par la vue) et les valeurs inchangées sont réutilisés.
+        """
+        car_id = slugify(profile["Name"])
+        previous = self.cars.get(car_id)
+        store = self.values.get(car_id)
+        if store is None:
+            store = self.values[car_id] = CarValues()
+
+        if previous is None:
+            self._vehicle_listeners(car_id)
+        version = previous.version + 1 if previous is not None else 1
+        changed = store.update(items, version)
+        if store.set("time", time, version):
+            changed.add("time")
+
+        if previous is not None and previous.profile == profile:
+            frozen_profile = previous.profile
+        else:
+            frozen_profile = MappingProxyType(dict(profile))
+
+        if previous is not None:
+            changed |= self._meta_changes(previous.meta, meta)
+            if not changed and frozen_profile is previous.profile:
+                return previous  # rien de neuf : même version
+
+        snapshot = self.cars[car_id] = CarSnapshot(version, frozen_profile, meta, time)
+        self.data = snapshot
+
+        # 1re publication : tout a changé
+        self._async_notify_entities(car_id, changed if previous is not None else None)
+        # Écouteurs génériques éventuels (hors entités Torque)
+        self.async_update_listeners()
+        return snapshot
 
     # --- Helpers de création ---------------------------------------------------
 
@@ -81,94 +247,163 @@ class TorqueLoggerCoordinator(DataUpdateCoordinator):
         return n.endswith(("status", "state", "mode")) or "état" in n or "statut" in n
 
     # --------- Création/MAJ d'entités ----------
-    async def add_entities(self, session_data: dict) -> None:
-        """Créer les entités manquantes pour une voiture donnée."""
-        car_name = session_data["profile"]["Name"]
-        car_id = slugify(car_name)
-
-        # Mémorise/rafraîchit les dernières données
-        self.cars[car_id] = session_data
-
+    def _device_info(self, car_id: str, car_name: str, version: Optional[str]) -> DeviceInfo:
+        """DeviceInfo du véhicule, construit une fois par (nom, version)."""
+        cached = self._devices.get(car_id)
+        if cached is not None and cached[0] == (car_name, version):
+            return cached[1]
         device = DeviceInfo(
             identifiers={(DOMAIN, car_id)},
             manufacturer="Torque",
             model=car_name,
             name=car_name,
-            sw_version=session_data["profile"].get("version"),
+            sw_version=version,
         )
+        self._devices[car_id] = ((car_name, version), device)
+        return device
+
+    async def add_entities(self, snapshot: CarSnapshot, schema: Optional[tuple] = None) -> None:
+        """Découvre les entités manquantes d'une voiture et planifie leur création.
+
+        `schema` : empreinte du layout de la session ; si elle a déjà été entièrement
+        découverte pour cette voiture, la découverte est sautée. Les clés écartées
+        sont mémorisées (avec leurs méta) et les nouvelles entités sont regroupées
+        puis ajoutées en un seul appel par plateforme (cf. _async_flush_pending).
+        """
+        car_name = snapshot.profile["Name"]
+        car_id = slugify(car_name)
 
-        new_sensors: list[TorqueSensor] = []
-        new_trackers: list[TorqueDeviceTracker] = []
+        if schema is not None and self._discovered.get(car_id) == schema:
+            return
 
-        meta_map = session_data.get("meta", {})
+        device = self._device_info(car_id, car_name, snapshot.profile.get("version"))
+        pending_sensors = self._pending_sensors.setdefault(car_id, {})
+        rejected = self._rejected.setdefault(car_id, {})
+        found = False
 
         # --- Capteurs ---
-        for key, meta in meta_map.items():
+        for key, meta in snapshot.meta.items():
             # Ne pas créer de capteur pour les coordonnées (réservé au device_tracker)
-            if key in (TORQUE_GPS_LAT, TORQUE_GPS_LON):
+            if key in (TORQUE_GPS_LAT, TORQUE_GPS_LON) or key in pending_sensors:
+                continue
+            # Déjà écartée avec les mêmes méta : rien à réévaluer
+            if rejected.get(key) == meta:
+                continue
+            if f"{car_id}:{key}" in self.tracked:
                 continue
 
             sensor_name = meta.get("name") or key
             unit = (meta.get("unit") or "").strip()
-            tracked_key = f"{car_id}:{key}"
-
-            # Évite doublons si déjà créé
-            if tracked_key in self.tracked:
-                continue
 
             # Filtrage "numérique only", sauf si capteur explicitement textuel utile
             if unit == "" and not self._is_textual_sensor(sensor_name):
                 _LOGGER.debug("Skipping non-numeric sensor without unit: %s (%s)", sensor_name, key)
+                rejected[key] = meta
                 continue
 
             # Optionnel: ignorer les capteurs sans vrai nom (même valeur que la clé)
             # Garde si tu veux des entités plus propres; commente si tu préfères tout créer.
             if sensor_name == key:
                 _LOGGER.debug("Skipping sensor without friendly name (name==key): %s", key)
+                rejected[key] = meta
                 continue
 
-            new_sensors.append(TorqueSensor(self, self.entry, key, device))
+            rejected.pop(key, None)
+            pending_sensors[key] = TorqueSensor(self, self.entry, key, device)
+            found = True
 
         # --- Device tracker (GPS lat/lon requis) ---
+        values = self.values.get(car_id) or ()
         if (
-            TORQUE_GPS_LAT in session_data
-            and TORQUE_GPS_LON in session_data
+            TORQUE_GPS_LAT in values
+            and TORQUE_GPS_LON in values
+            and car_id not in self._pending_trackers
             and f"{car_id}:{ENTITY_GPS}" not in self.tracked
         ):
-            new_trackers.append(TorqueDeviceTracker(self, self.entry, device))
-
-        sensor_cb_ready = callable(self.async_add_sensor)
-        tracker_cb_ready = callable(self.async_add_device_tracker)
-
-        if new_sensors and sensor_cb_ready:
-            self.tracked.update(f"{car_id}:{s.sensor_key}" for s in new_sensors)
-            self.async_add_sensor(new_sensors)
-        elif new_sensors and not sensor_cb_ready:
-            _LOGGER.debug(
-                "Sensor platform not ready yet; will try again on next payload "
-                "(%d sensors pending for %s).",
-                len(new_sensors),
-                car_name,
-            )
-
-        if new_trackers and tracker_cb_ready:
-            self.tracked.update(f"{car_id}:{t.sensor_key}" for t in new_trackers)
-            self.async_add_device_tracker(new_trackers)
-        elif new_trackers and not tracker_cb_ready:
-            _LOGGER.debug(
-                "Device tracker platform not ready yet; will try again on next payload "
-                "(%d trackers pending for %s).",
-                len(new_trackers),
-                car_name,
-            )
-
-        _LOGGER.debug("Tracked entities: %s", ", ".join(sorted(self.tracked)))
+            self._pending_trackers[car_id] = TorqueDeviceTracker(self, self.entry, device)
+            found = True
+
+        if found:
+            self._schedule_flush(car_id)
+
+        # Tout est créé, en attente ou écarté : ce schéma n'a plus à être redécouvert
+        if schema is not None:
+            self._discovered[car_id] = schema
+
+    @callback
+    def _schedule_flush(self, car_id: str) -> None:
+        """Regroupe les créations d'une voiture sur une fenêtre de debounce."""
+        if car_id in self._flush_unsub:
+            return
+
+        @callback
+        def _flush(_now) -> None:
+            self._flush_unsub.pop(car_id, None)
+            self._async_flush_pending(car_id)
+
+        self._flush_unsub[car_id] = async_call_later(
+            self.hass, ENTITY_DISCOVERY_DEBOUNCE_SECONDS, _flush
+        )
+
+    @callback
+    def _async_flush_pending(self, car_id: str) -> None:
+        """Ajoute en un appel par plateforme les entités en attente d'une voiture."""
+        sensors = self._pending_sensors.get(car_id)
+        if sensors:
+            if callable(self.async_add_sensor):
+                self._pending_sensors.pop(car_id, None)
+                self.tracked.update(f"{car_id}:{key}" for key in sensors)
+                self.async_add_sensor(list(sensors.values()))
+                self.stats["add_calls"] += 1
+                self.stats["entities_added"] += len(sensors)
+            else:
+                _LOGGER.debug(
+                    "Sensor platform not ready yet; retrying (%d sensors pending for %s).",
+                    len(sensors),
+                    car_id,
+                )
+
+        tracker = self._pending_trackers.get(car_id)
+        if tracker is not None:
+            if callable(self.async_add_device_tracker):
+                self._pending_trackers.pop(car_id, None)
+                self.tracked.add(f"{car_id}:{tracker.sensor_key}")
+                self.async_add_device_tracker([tracker])
+                self.stats["add_calls"] += 1
+                self.stats["entities_added"] += 1
+            else:
+                _LOGGER.debug(
+                    "Device tracker platform not ready yet; retrying (tracker pending for %s).",
+                    car_id,
+                )
+
+        # Plateforme pas encore prête : nouvel essai à la fenêtre suivante
+        if self._pending_sensors.get(car_id) or car_id in self._pending_trackers:
+            self._schedule_flush(car_id)
+
+    @callback
+    def async_cancel_discovery(self) -> None:
+        """Annule les créations d'entités en attente (déchargement de l'entrée)."""
+        for unsub in self._flush_unsub.values():
+            unsub()
+        self._flush_unsub.clear()
+        self._pending_sensors.clear()
+        self._pending_trackers.clear()
 
     # --------- Support suppression d’un véhicule depuis l’UI ----------
     def forget_vehicle(self, vehicle_key: str) -> None:
         """Oublier définitivement un véhicule (clef = car_id)."""
         # Supprime les données mémorisées
         self.cars.pop(vehicle_key, None)
+        self.values.pop(vehicle_key, None)
+        self._vehicles.pop(vehicle_key, None)
+        self._discovered.pop(vehicle_key, None)
+        self._devices.pop(vehicle_key, None)
+        self._rejected.pop(vehicle_key, None)
+        self._pending_sensors.pop(vehicle_key, None)
+        self._pending_trackers.pop(vehicle_key, None)
+        if (unsub := self._flush_unsub.pop(vehicle_key, None)) is not None:
+            unsub()
         # Purge les capteurs/tracker associés
         to_remove = {k for k in self.tracked if k.startswith(f"{vehicle_key}:")}
         if to_remove:
@@ -49,17 +49,19 @@ async def async_setup_entry(
     coordinator: "TorqueLoggerCoordinator" = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     coordinator.async_add_device_tracker = async_add_entities
 
-    # Restore previously loaded trackers
+    # Restore previously loaded trackers (véhicules de cette entrée uniquement)
     dev_reg = dr.async_get(hass)
     devices = [
         device
-        for device in dev_reg.devices.values()
+        for device in dr.async_entries_for_config_entry(dev_reg, entry.entry_id)
         if any(ident[0] == DOMAIN for ident in device.identifiers)
     ]
     _LOGGER.debug("%d device_tracker to restore", len(devices))
 
+    trackers = []
     for device in devices:
         _LOGGER.debug("Restoring %s device_tracker", device.model)
+        car_id = next(ident[1] for ident in device.identifiers if ident[0] == DOMAIN)
         device_info = DeviceInfo(
             identifiers=device.identifiers,
             manufacturer=device.manufacturer,
@@ -67,7 +69,13 @@ async def async_setup_entry(
             name=device.name,
             sw_version=device.sw_version,
         )
-        async_add_entities([TorqueDeviceTracker(coordinator, entry, device_info)])
+        trackers.append(TorqueDeviceTracker(coordinator, entry, device_info))
+        # Déjà créé : la découverte ne doit pas le proposer à nouveau
+        coordinator.tracked.add(f"{car_id}:{ENTITY_GPS}")
+
+    # Un seul ajout groupé pour tous les véhicules
+    if trackers:
+        async_add_entities(trackers)
 
 
 class TorqueDeviceTracker(TorqueEntity, TrackerEntity, RestoreEntity):
@@ -88,12 +96,9 @@ class TorqueDeviceTracker(TorqueEntity, TrackerEntity, RestoreEntity):
     @property
     def location_accuracy(self) -> float:
         """Return GPS accuracy in meters (float)."""
-        val = self.coordinator.get_value(self._car_id, TORQUE_GPS_ACCURACY)
+        val = self.coordinator.get_float(self._car_id, TORQUE_GPS_ACCURACY)
         if val is not None:
-            try:
-                return float(val)
-            except (ValueError, TypeError):
-                pass
+            return val
 
         # fallback sur l'état restauré
         if self._restored_state and self._restored_state.get(ATTR_GPS_ACCURACY) is not None:
@@ -107,12 +112,9 @@ class TorqueDeviceTracker(TorqueEntity, TrackerEntity, RestoreEntity):
     @property
     def latitude(self) -> Optional[float]:
         """Return latitude value of the device."""
-        val = self.coordinator.get_value(self._car_id, TORQUE_GPS_LAT)
+        val = self.coordinator.get_float(self._car_id, TORQUE_GPS_LAT)
         if val is not None:
-            try:
-                return float(val)
-            except (ValueError, TypeError):
-                return None
+            return val
 
         if self._restored_state and self._restored_state.get(ATTR_LATITUDE) is not None:
             try:
@@ -124,12 +126,9 @@ class TorqueDeviceTracker(TorqueEntity, TrackerEntity, RestoreEntity):
     @property
     def longitude(self) -> Optional[float]:
         """Return longitude value of the device."""
-        val = self.coordinator.get_value(self._car_id, TORQUE_GPS_LON)
+        val = self.coordinator.get_float(self._car_id, TORQUE_GPS_LON)
         if val is not None:
-            try:
-                return float(val)
-            except (ValueError, TypeError):
-                return None
+            return val
 
         if self._restored_state and self._restored_state.get(ATTR_LONGITUDE) is not None:
             try:
@@ -149,12 +148,9 @@ class TorqueDeviceTracker(TorqueEntity, TrackerEntity, RestoreEntity):
         attrs: Dict[str, Any] = {}
 
         # Altitude
-        alt = self.coordinator.get_value(self._car_id, TORQUE_GPS_ALTITUDE)
+        alt = self.coordinator.get_float(self._car_id, TORQUE_GPS_ALTITUDE)
         if alt is not None:
-            try:
-                attrs[ATTR_ALTITUDE] = float(alt)
-            except (ValueError, TypeError):
-                pass
+            attrs[ATTR_ALTITUDE] = alt
         elif self._restored_state and self._restored_state.get(ATTR_ALTITUDE) is not None:
             try:
                 attrs[ATTR_ALTITUDE] = float(self._restored_state[ATTR_ALTITUDE])
@@ -162,12 +158,9 @@ class TorqueDeviceTracker(TorqueEntity, TrackerEntity, RestoreEntity):
                 pass
 
         # Vitesse (si disponible côté payload, ex. shortName "speed")
-        spd = self.coordinator.get_value(self._car_id, ATTR_SPEED)
+        spd = self.coordinator.get_float(self._car_id, ATTR_SPEED)
         if spd is not None:
-            try:
-                attrs[ATTR_SPEED] = float(spd)
-            except (ValueError, TypeError):
-                pass
+            attrs[ATTR_SPEED] = spd
         elif self._restored_state and self._restored_state.get(ATTR_SPEED) is not None:
             try:
                 attrs[ATTR_SPEED] = float(self._restored_state[ATTR_SPEED])
@@ -175,12 +168,9 @@ class TorqueDeviceTracker(TorqueEntity, TrackerEntity, RestoreEntity):
                 pass
 
         # Horodatage GPS : la vue met "time" au niveau racine → map vers ATTR_GPS_TIME
-        gps_time = self.coordinator.get_value(self._car_id, "time")
+        gps_time = self.coordinator.get_float(self._car_id, "time")
         if gps_time is not None:
-            try:
-                attrs[ATTR_GPS_TIME] = int(gps_time)
-            except (ValueError, TypeError):
-                pass
+            attrs[ATTR_GPS_TIME] = int(gps_time)
         elif self._restored_state and self._restored_state.get(ATTR_GPS_TIME) is not None:
             try:
                 attrs[ATTR_GPS_TIME] = int(self._restored_state[ATTR_GPS_TIME])
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Diagnostics support for Torque Logger 2025."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, CONF_EMAIL
+
+TO_REDACT = {CONF_EMAIL}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    domain_store: dict = hass.data.get(DOMAIN, {})
+    view = domain_store.get("view")
+    coordinator = domain_store.get(entry.entry_id, {}).get("coordinator")
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "view": view.diagnostics(entry.entry_id) if view is not None else None,
+        "vehicles": sorted(coordinator.cars) if coordinator is not None else [],
+        "entities": dict(coordinator.stats) if coordinator is not None else None,
+        "listeners_per_vehicle": (
+            coordinator.listener_counts()
+            if coordinator is not None
+            else {}
+        ),
+        "values_memory_bytes": (
+            {car_id: store.memory_footprint() for car_id, store in coordinator.values.items()}
+            if coordinator is not None
+            else {}
+        ),
+    }
@@ -83,13 +83,16 @@ class TorqueEntity(CoordinatorEntity):
         sensor_key: str,
         device: DeviceInfo | Mapping[str, Any] | Any,
     ) -> None:
-        super().__init__(coordinator)
+        # ID véhicule (fonctionne pour dict ou objet) : sert aussi de contexte d'écoute
+        # -> le coordinator ne réveille l'entité que si (car_id, sensor_key) change.
+        car_id = _extract_car_id(device)
+        super().__init__(coordinator, context=(car_id, sensor_key))
 
         self.config_entry = config_entry
         self.sensor_key = sensor_key
 
-        # ID & nom véhicule (fonctionnent pour dict ou objet)
-        self._car_id = _extract_car_id(device)
+        # ID & nom véhicule
+        self._car_id = car_id
         model = _get_attr_or_key(device, "model", "model")
         name = _get_attr_or_key(device, "name", "name")
         self._car_name = model or name or "Vehicle"
@@ -0,0 +1,377 @@
+# -*- coding: utf-8 -*-
+"""Ingest queue for Torque Logger 2025."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+import asyncio
+import heapq
+import logging
+import time
+
+from .const import (
+    INGEST_BATCH_SIZE,
+    INGEST_QUEUE_MAXSIZE,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    RATE_LIMIT_MAX_SOURCES,
+    REORDER_MAX_PENDING,
+    QUEUE_POLICY_COALESCE,
+)
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+
+class IngestItem:
+    """Upload Torque brut en attente de traitement."""
+
+    __slots__ = ("key", "query", "lang", "route", "received")
+
+    def __init__(
+        self,
+        key: str,
+        query: str,
+        lang: str,
+        received: Optional[float] = None,
+        route: Any = None,
+    ) -> None:
+        self.key = key  # clé de regroupement par véhicule (id Torque, sinon session)
+        self.query = query  # query string brute
+        self.lang = lang  # langue résolue pour la requête
+        self.route = route  # entrée de configuration destinataire (cf. api._Route)
+        self.received = time.monotonic() if received is None else received
+
+
+def _query_parts(raw: str) -> dict[str, str]:
+    """Segments `clé=valeur` bruts d'une query, indexés par clé (ordre conservé)."""
+    return {part.partition("=")[0]: part for part in raw.split("&") if part}
+
+
+def _query_time(parts: dict[str, str]) -> Optional[int]:
+    part = parts.get("time")
+    if part is None:
+        return None
+    try:
+        return int(part.partition("=")[2])
+    except ValueError:
+        return None
+
+
+def merge_uploads(pending: IngestItem, item: IngestItem) -> None:
+    """Fusionne `item` dans l'upload en attente `pending` (en place).
+
+    Torque envoie métadonnées (userFullName*, userShortName*, defaultUnit*) et
+    valeurs dans des uploads distincts : la dernière valeur de chaque clé est
+    retenue, les clés absentes du nouvel upload (métadonnées, profil) sont
+    conservées et `time` reste le plus récent des deux.
+    """
+    parts = _query_parts(pending.query)
+    new_parts = _query_parts(item.query)
+    pending_time, new_time = _query_time(parts), _query_time(new_parts)
+    if pending_time is not None and new_time is not None and new_time < pending_time:
+        # Upload plus ancien que celui en attente : il ne complète que les clés absentes
+        for key, part in new_parts.items():
+            parts.setdefault(key, part)
+    else:
+        parts.update(new_parts)
+        pending.lang = item.lang
+        pending.received = item.received
+    pending.query = "&".join(parts.values())
+
+
+class IngestQueue:
+    """File bornée entre la vue HTTP et le worker d'ingestion.
+
+    La vue y dépose la query brute et répond aussitôt à Torque ; un worker
+    (`async_run`) la vide par lots. Quand la file est pleine, selon la
+    politique de l'entrée de l'upload déposé :
+    - `drop_oldest` : l'upload le plus ancien est abandonné ;
+    - `coalesce` : le nouvel upload est fusionné, à sa place dans la file, à
+      celui en attente du même véhicule (cf. `merge_uploads` ; à défaut, le
+      plus ancien est abandonné).
+    """
+
+    def __init__(
+        self,
+        maxsize: int = INGEST_QUEUE_MAXSIZE,
+        batch_size: int = INGEST_BATCH_SIZE,
+    ) -> None:
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self._items: OrderedDict[int, IngestItem] = OrderedDict()
+        self._seq_by_key: dict[str, int] = {}
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+        self.stats: dict[str, int] = {
+            "enqueued": 0,
+            "processed": 0,
+            "batches": 0,
+            "dropped": 0,
+            "coalesced": 0,
+            "max_depth": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, item: IngestItem, policy: str = QUEUE_POLICY_COALESCE) -> None:
+        """Dépose un upload (jamais bloquant : applique `policy` si la file est pleine)."""
+        if len(self._items) >= self.maxsize:
+            old_seq = self._seq_by_key.get(item.key) if policy == QUEUE_POLICY_COALESCE else None
+            if old_seq is not None:
+                merge_uploads(self._items[old_seq], item)
+                self.stats["coalesced"] += 1
+                return
+            dropped_seq, dropped = self._items.popitem(last=False)
+            self._forget(dropped, dropped_seq)
+            self.stats["dropped"] += 1
+
+        self._seq += 1
+        self._items[self._seq] = item
+        self._seq_by_key[item.key] = self._seq
+        self.stats["enqueued"] += 1
+        depth = len(self._items)
+        if depth > self.stats["max_depth"]:
+            self.stats["max_depth"] = depth
+        self._wakeup.set()
+
+    def drain(self, limit: Optional[int] = None) -> list[IngestItem]:
+        """Retire jusqu'à `limit` uploads, du plus ancien au plus récent."""
+        limit = self.batch_size if limit is None else limit
+        batch: list[IngestItem] = []
+        while self._items and len(batch) < limit:
+            seq, item = self._items.popitem(last=False)
+            self._forget(item, seq)
+            batch.append(item)
+        if not self._items:
+            self._wakeup.clear()
+        return batch
+
+    def _forget(self, item: IngestItem, seq: int) -> None:
+        if self._seq_by_key.get(item.key) == seq:
+            del self._seq_by_key[item.key]
+
+    async def async_run(self, handler: Callable[[list[IngestItem]], Awaitable[None]]) -> None:
+        """Boucle du worker : vide la file par lots et les passe à `handler`."""
+        while True:
+            await self._wakeup.wait()
+            batch = self.drain()
+            if not batch:
+                continue
+            self.stats["batches"] += 1
+            try:
+                await handler(batch)
+            except Exception as err:  # le worker ne doit jamais mourir
+                _LOGGER.exception("Error processing Torque ingest batch: %s", err)
+            self.stats["processed"] += len(batch)
+            # Laisse la main à la boucle entre deux lots
+            await asyncio.sleep(0)
+
+    def diagnostics(self) -> dict[str, Any]:
+        return {
+            "depth": len(self._items),
+            "maxsize": self.maxsize,
+            "batch_size": self.batch_size,
+            "stats": dict(self.stats),
+        }
+
+
+class ReorderBuffer:
+    """Fenêtre de réordonnancement par session, sur le champ `time` de Torque.
+
+    Un échantillon est retenu jusqu'à ce qu'il soit plus vieux que le plus
+    récent reçu de `window` secondes (watermark), ou qu'il ait attendu `window`
+    secondes ; les échantillons sont alors rendus dans l'ordre de `time`.
+    La fenêtre est propre à chaque session (celle de son entrée).
+    """
+
+    def __init__(self, max_pending: int = REORDER_MAX_PENDING) -> None:
+        self.max_pending = max_pending
+        # session -> tas de (time s, seq, reçu à, payload)
+        self._pending: dict[Any, list[tuple[float, int, float, Any]]] = {}
+        # session -> time le plus récent reçu
+        self._newest: dict[Any, float] = {}
+        # session -> fenêtre (s)
+        self._windows: dict[Any, float] = {}
+        self._seq = 0
+        self.stats: dict[str, int] = {"held": 0, "reordered": 0}
+
+    def __len__(self) -> int:
+        return sum(len(heap) for heap in self._pending.values())
+
+    def push(
+        self, session: Any, ts: float, payload: Any, window: float, now: Optional[float] = None
+    ) -> None:
+        now = time.monotonic() if now is None else now
+        self._windows[session] = float(window)
+        newest = self._newest.get(session)
+        if newest is not None and ts < newest:
+            self.stats["reordered"] += 1
+        if newest is None or ts > newest:
+            self._newest[session] = ts
+        self._seq += 1
+        heapq.heappush(self._pending.setdefault(session, []), (ts, self._seq, now, payload))
+        self.stats["held"] += 1
+
+    def pop_ready(self, now: Optional[float] = None) -> list[tuple[Any, Any]]:
+        """Rend les échantillons sortis de la fenêtre, par session et dans l'ordre de `time`."""
+        now = time.monotonic() if now is None else now
+        ready: list[tuple[Any, Any]] = []
+        for session in list(self._pending):
+            heap = self._pending[session]
+            window = self._windows[session]
+            # Watermark : tout ce qui précède (time le plus récent - fenêtre)
+            cutoff = self._newest[session] - window
+            # ... et tout ce qui précède un échantillon ayant assez attendu
+            for ts, _, received, _ in heap:
+                if ts > cutoff and now - received >= window:
+                    cutoff = ts
+            while heap and (heap[0][0] <= cutoff or len(heap) > self.max_pending):
+                ready.append((session, heapq.heappop(heap)[3]))
+            if not heap:
+                del self._pending[session]
+                del self._newest[session]
+                del self._windows[session]
+        return ready
+
+    def next_deadline(self) -> Optional[float]:
+        """Délai (s) avant que le plus ancien échantillon retenu soit rendu."""
+        deadline = min(
+            (
+                received + self._windows[session]
+                for session, heap in self._pending.items()
+                for _, _, received, _ in heap
+            ),
+            default=None,
+        )
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.monotonic())
+
+    def diagnostics(self) -> dict[str, Any]:
+        return {"sessions": len(self._pending), "pending": len(self), **self.stats}
+
+
+class _TokenBucket:
+    """Jetons d'une source, son débit et dernier upload retenu faute de jeton."""
+
+    __slots__ = ("tokens", "updated", "rate", "burst", "held")
+
+    def __init__(self, rate: float, burst: int, now: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+        self.held: Optional[IngestItem] = None
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(float(self.burst), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class RateLimiter:
+    """Limitation de débit par source (token bucket).
+
+    Chaque source (id Torque / session, adresse distante) dispose de `burst`
+    jetons, regagnés à raison de `rate` par seconde (réglages de son entrée).
+    Un upload sans jeton n'est pas perdu : il est retenu pour la source (fusionné
+    avec celui déjà retenu, cf. `merge_uploads`) et rendu dès qu'un jeton est
+    disponible (cf. `pop_ready`). `rate` = 0 : pas de limite.
+    """
+
+    def __init__(self, max_sources: int = RATE_LIMIT_MAX_SOURCES) -> None:
+        self.max_sources = max_sources
+        self._buckets: OrderedDict[Any, _TokenBucket] = OrderedDict()
+        self._held = 0
+        self.stats: dict[str, int] = {"allowed": 0, "throttled": 0, "coalesced": 0, "released": 0}
+
+    def admit(
+        self,
+        source: Any,
+        item: IngestItem,
+        rate: float = DEFAULT_RATE_LIMIT,
+        burst: int = DEFAULT_RATE_BURST,
+        now: Optional[float] = None,
+    ) -> bool:
+        """True si l'upload peut passer ; sinon il est retenu (fusionné au précédent retenu)."""
+        bucket = self._buckets.get(source)
+        if rate <= 0 and (bucket is None or bucket.held is None):
+            return True
+        now = time.monotonic() if now is None else now
+        burst = max(1, int(burst))
+        if bucket is None:
+            bucket = self._buckets[source] = _TokenBucket(float(rate), burst, now)
+            self._evict()
+        else:
+            self._buckets.move_to_end(source)
+            bucket.refill(now)
+            bucket.rate, bucket.burst = float(rate), burst
+
+        # Un upload déjà retenu passe avant : le nouveau y est fusionné
+        if bucket.held is None and bucket.tokens >= 1:
+            bucket.tokens -= 1
+            self.stats["allowed"] += 1
+            return True
+
+        self.stats["throttled"] += 1
+        if bucket.held is not None:
+            merge_uploads(bucket.held, item)
+            self.stats["coalesced"] += 1
+        else:
+            self._held += 1
+            bucket.held = item
+        return False
+
+    def _evict(self) -> None:
+        # Sources les moins récentes oubliées ; jamais celles qui retiennent un upload
+        for source in list(self._buckets):
+            if len(self._buckets) <= self.max_sources:
+                break
+            if self._buckets[source].held is None:
+                del self._buckets[source]
+
+    def pop_ready(self, now: Optional[float] = None) -> list[IngestItem]:
+        """Rend les uploads retenus dont la source a regagné un jeton."""
+        if not self._held:
+            return []
+        now = time.monotonic() if now is None else now
+        ready: list[IngestItem] = []
+        for bucket in self._buckets.values():
+            if bucket.held is None:
+                continue
+            bucket.refill(now)
+            if bucket.tokens >= 1 or bucket.rate <= 0:
+                bucket.tokens = max(0.0, bucket.tokens - 1)
+                ready.append(bucket.held)
+                bucket.held = None
+        self._held -= len(ready)
+        self.stats["released"] += len(ready)
+        return ready
+
+    def next_deadline(self) -> Optional[float]:
+        """Délai (s) avant qu'une source retenant un upload regagne un jeton."""
+        if not self._held:
+            return None
+        now = time.monotonic()
+        return max(
+            0.0,
+            min(
+                (1 - bucket.tokens) / bucket.rate - (now - bucket.updated) if bucket.rate > 0 else 0.0
+                for bucket in self._buckets.values()
+                if bucket.held is not None
+            ),
+        )
+
+    def diagnostics(self) -> dict[str, Any]:
+        now = time.monotonic()
+        throttled = 0
+        for bucket in self._buckets.values():
+            tokens = min(float(bucket.burst), bucket.tokens + (now - bucket.updated) * bucket.rate)
+            if bucket.held is not None or tokens < 1:
+                throttled += 1
+        return {
+            "sources": len(self._buckets),
+            "sources_throttled": throttled,
+            "held": self._held,
+            "stats": dict(self.stats),
+        }
@@ -6,13 +6,16 @@ from __future__ import annotations
 import logging
 import re
 import math
-from typing import TYPE_CHECKING, List, Optional
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Mapping, Optional
 
 from homeassistant.components.sensor import RestoreSensor
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers import entity_registry as er, device_registry as dr
 
 from .const import (
@@ -27,8 +30,21 @@ from .const import (
     TIME_ICON,
     CONF_LANGUAGE,
     DEFAULT_LANGUAGE,
+    CONF_DEADBAND,
+    CONF_DEADBAND_ABSOLUTE,
+    CONF_DEADBAND_PERCENT,
+    CONF_MIN_INTERVAL,
+    CONF_MAX_AGE,
+    DEFAULT_DEADBAND,
+    DEFAULT_DEADBAND_ABSOLUTE,
+    DEFAULT_DEADBAND_PERCENT,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_MAX_AGE,
+    DEADBAND_DEFAULTS,
+    DEADBAND_FALLBACK,
 )
 from .entity import TorqueEntity
+from .values import parse_unit_thresholds
 
 if TYPE_CHECKING:
     from .coordinator import TorqueLoggerCoordinator
@@ -47,19 +63,27 @@ async def async_setup_entry(
     ent_reg = er.async_get(hass)
     dev_reg = dr.async_get(hass)
 
-    devices = [
-        device
-        for device in dev_reg.devices.values()
-        if any(ident[0] == DOMAIN for ident in device.identifiers)
-    ]
-    _LOGGER.debug("%d devices found for restore", len(devices))
+    # Index en une passe : device_id -> unique_id des capteurs de cette entrée
+    prefix_entry = f"{DOMAIN}_{entry.entry_id}_"
+    keys_by_device: dict[str, list[str]] = {}
+    for er_ent in er.async_entries_for_config_entry(ent_reg, entry.entry_id):
+        if (
+            er_ent.domain == SENSOR
+            and er_ent.device_id
+            and er_ent.unique_id
+            and er_ent.unique_id.startswith(prefix_entry)
+        ):
+            keys_by_device.setdefault(er_ent.device_id, []).append(er_ent.unique_id)
+    _LOGGER.debug("%d devices found for restore", len(keys_by_device))
 
     to_add: List["TorqueSensor"] = []
 
-    for device in devices:
-        try:
-            car_id = next(ident[1] for ident in device.identifiers if ident[0] == DOMAIN)
-        except StopIteration:
+    for device_id, unique_ids in keys_by_device.items():
+        device = dev_reg.async_get(device_id)
+        if device is None:
+            continue
+        car_id = next((ident[1] for ident in device.identifiers if ident[0] == DOMAIN), None)
+        if car_id is None:
             _LOGGER.debug("Skipping device without %s identifier: %s", DOMAIN, device.id)
             continue
 
@@ -71,27 +95,17 @@ async def async_setup_entry(
             sw_version=device.sw_version,
         )
 
-        prefix = f"{DOMAIN}_{entry.entry_id}_{car_id}_"
+        prefix = f"{prefix_entry}{car_id}_"
         restore_entities = [
-            TorqueSensor(
-                coordinator,
-                entry,
-                er_ent.unique_id[len(prefix):],
-                device_info,
-            )
-            for er_ent in ent_reg.entities.values()
-            if er_ent.device_id == device.id
-            and er_ent.domain == SENSOR
-            and er_ent.unique_id
-            and er_ent.unique_id.startswith(prefix)
+            TorqueSensor(coordinator, entry, unique_id[len(prefix):], device_info)
+            for unique_id in unique_ids
+            if unique_id.startswith(prefix)
         ]
 
         if restore_entities:
-            _LOGGER.debug(
-                "Restoring sensors for %s: %s",
-                device.model,
-                ", ".join(e.sensor_key for e in restore_entities),
-            )
+            _LOGGER.debug("Restoring %d sensors for %s", len(restore_entities), device.model)
+            # Déjà créés : la découverte ne doit pas les proposer à nouveau
+            coordinator.tracked.update(f"{car_id}:{e.sensor_key}" for e in restore_entities)
             to_add.extend(restore_entities)
 
     if to_add:
@@ -109,19 +123,83 @@ def _to_finite_float(val):
     return f if math.isfinite(f) else None
 
 
+def _unit_thresholds(value) -> Mapping[str, float]:
+    """Seuils absolus par unité des options (ancienne valeur numérique globale ignorée)."""
+    if not isinstance(value, str):
+        return {}
+    try:
+        return parse_unit_thresholds(value)
+    except ValueError:
+        _LOGGER.warning("Ignoring invalid per-unit deadband option: %r", value)
+        return {}
+
+
+_KMH_RE = re.compile(r"\b(?:kmh|kph)\b", re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
 def _title_from_key(key: str) -> str:
     """Nom lisible par défaut à partir d'une clé slug (fallback si pas de meta/restore)."""
     s = key.replace("_", " ").strip()
-    s = re.sub(r"\bkmh\b", "km/h", s, flags=re.I)
-    s = re.sub(r"\bkph\b", "km/h", s, flags=re.I)
+    s = _KMH_RE.sub("km/h", s)
     return s[:1].upper() + s[1:]
 
 
+@lru_cache(maxsize=256)
+def _prefix_pattern(prefix: str) -> re.Pattern:
+    """Motif compilé une fois par préfixe (nom du véhicule)."""
+    return re.compile(rf"^(?:{re.escape(prefix)}\s+)+", flags=re.IGNORECASE)
+
+
 def _strip_repeated_prefix(text: str, prefix: Optional[str]) -> str:
     if not text or not prefix:
         return text
-    pat = re.compile(rf"^(?:{re.escape(prefix)}\s+)+", flags=re.IGNORECASE)
-    return pat.sub("", text).strip()
+    return _prefix_pattern(prefix).sub("", text).strip()
+
+
+# --- Classification des icônes -------------------------------------------------
+# Unité normalisée -> icône (prioritaire sur le nom)
+_ICON_BY_UNIT: dict[str, str] = {
+    **{u: DISTANCE_ICON for u in ("km", "mi", "m", "ft")},
+    **{u: SPEED_ICON for u in ("km/h", "mph", "m/s", "kn")},
+    **{u: FUEL_ICON for u in ("l/100km", "mpg", "km/l", "l", "gal", "wh/km", "kwh/100km", "gph")},
+    **{u: TIME_ICON for u in ("s", "sec", "secs", "secondes", "min", "mins", "h", "hr", "hrs", "ms")},
+}
+
+# Règles sur le nom, dans l'ordre de priorité (motifs compilés une seule fois)
+_ICON_NAME_RULES: tuple[tuple[re.Pattern, str], ...] = (
+    (re.compile(r"\b(distance|kilometers?|miles?|kilom(è|e)tres?)\b", re.IGNORECASE), DISTANCE_ICON),
+    (re.compile(r"\b(speed|vitesse)\b", re.IGNORECASE), SPEED_ICON),
+    (
+        re.compile(
+            r"\b(litre?s?|gallons?|fuel|carburant|essence|diesel)\b"
+            r"|\b(l/100 ?km|mpg|km/l|wh/km|kwh/100km|gph)\b",
+            re.IGNORECASE,
+        ),
+        FUEL_ICON,
+    ),
+    (re.compile(r"\b(time|min|sec|dur(é|e)e|ralenti|idle)\b", re.IGNORECASE), TIME_ICON),
+    (re.compile(r"\b(autoroute|highway)\b", re.IGNORECASE), HIGHWAY_ICON),
+    (re.compile(r"\b(ville|city)\b", re.IGNORECASE), CITY_ICON),
+)
+
+
+def _normalize_unit(unit: Optional[str]) -> str:
+    u = (unit or "").strip().lower().replace(" ", "")
+    return u.replace("kmh", "km/h").replace("kph", "km/h")
+
+
+@lru_cache(maxsize=4096)
+def _classify_icon(unit: str, name: str) -> str:
+    """Icône d'un capteur d'après son unité normalisée puis son nom (mémoïsé, partagé)."""
+    icon = _ICON_BY_UNIT.get(unit)
+    if icon is not None:
+        return icon
+    n = name.lower()
+    for pattern, icon in _ICON_NAME_RULES:
+        if pattern.search(n):
+            return icon
+    return DEFAULT_ICON
 
 
 # --- Localisation FR par *clé* shortName (slug) ------------------------------
@@ -258,6 +336,20 @@ class TorqueSensor(TorqueEntity, RestoreSensor):
         self._restored_state = None
         self._customized_name = False
 
+        # Filtrage des écritures (deadband / intervalle minimal / âge max)
+        opts = config_entry.options
+        self._deadband_enabled = bool(opts.get(CONF_DEADBAND, DEFAULT_DEADBAND))
+        self._deadband_absolute = _unit_thresholds(opts.get(CONF_DEADBAND_ABSOLUTE, DEFAULT_DEADBAND_ABSOLUTE))
+        self._deadband_percent = float(opts.get(CONF_DEADBAND_PERCENT, DEFAULT_DEADBAND_PERCENT))
+        self._min_interval = float(opts.get(CONF_MIN_INTERVAL, DEFAULT_MIN_INTERVAL))
+        self._max_age = float(opts.get(CONF_MAX_AGE, DEFAULT_MAX_AGE))
+        self._written_value = None
+        self._written_at: Optional[float] = None
+        self._flush_unsub: Optional[CALLBACK_TYPE] = None
+        # Dernière version vue (méta figées du coordinator + version de la valeur)
+        self._seen_meta = None
+        self._seen_version = -1
+
         # 1) Méta existantes ?
         meta = self.coordinator.get_meta(self._car_id)
         if meta and self.sensor_key in meta:
@@ -290,10 +382,11 @@ class TorqueSensor(TorqueEntity, RestoreSensor):
 
     # --- Rafraîchissement quand le coordinator bouge -------------------------
 
-    def _maybe_refresh_metadata(self) -> None:
+    def _maybe_refresh_metadata(self) -> bool:
+        """Rafraîchit nom/unité depuis les méta ; True si quelque chose a changé."""
         meta = self.coordinator.get_meta(self._car_id)
         if not meta or self.sensor_key not in meta:
-            return
+            return False
         m = meta[self.sensor_key]
         changed = False
 
@@ -314,19 +407,98 @@ class TorqueSensor(TorqueEntity, RestoreSensor):
 
         if changed:
             self._set_icon()
-            self.async_write_ha_state()
+        return changed
 
     def _handle_coordinator_update(self) -> None:
-        self._maybe_refresh_metadata()
-        super()._handle_coordinator_update()
+        # Versions : méta figées (comparées par identité) et version de la valeur
+        meta = self.coordinator.get_meta(self._car_id)
+        version = self.coordinator.get_version(self._car_id, self.sensor_key)
+        if meta is self._seen_meta and version == self._seen_version:
+            return
+        self._seen_version = version
+
+        meta_changed = False
+        if meta is not self._seen_meta:
+            self._seen_meta = meta
+            meta_changed = self._maybe_refresh_metadata()
+        value = self.native_value
+        now = time.monotonic()
+        if meta_changed or self._should_write(value, now):
+            self._write_state(value, now)
+
+    # --- Filtrage des écritures ------------------------------------------------
+
+    def _thresholds(self) -> tuple[float, float]:
+        """Seuils (absolu, relatif %) pour l'unité courante du capteur."""
+        abs_thr, pct_thr = DEADBAND_DEFAULTS.get(
+            self._attr_native_unit_of_measurement or "", DEADBAND_FALLBACK
+        )
+        abs_override = self._deadband_absolute.get(self._attr_native_unit_of_measurement or "")
+        if abs_override is not None:
+            abs_thr = abs_override
+        if self._deadband_percent > 0:
+            pct_thr = self._deadband_percent
+        return abs_thr, pct_thr
+
+    def _should_write(self, value, now: float) -> bool:
+        """Décide si la nouvelle valeur mérite une écriture d'état (sinon flush différé)."""
+        last = self._written_value
+        if self._written_at is None or value is None or last is None:
+            return True
+
+        elapsed = now - self._written_at
+        if elapsed >= self._max_age:
+            return True
+
+        if elapsed < self._min_interval:
+            if value != last:
+                self._schedule_flush(self._min_interval - elapsed)
+            return False
+
+        if value == last:
+            return False
+        if self._deadband_enabled:
+            abs_thr, pct_thr = self._thresholds()
+            delta = abs(value - last)
+            # Écrite si l'un des seuils est dépassé (seuil relatif ignoré s'il vaut 0)
+            if delta <= abs_thr and (not pct_thr or delta <= abs(last) * pct_thr / 100.0):
+                self._schedule_flush(self._max_age - elapsed)
+                return False
+        return True
+
+    def _write_state(self, value, now: float) -> None:
+        self._cancel_flush()
+        self._written_value = value
+        self._written_at = now
+        self.async_write_ha_state()
+
+    def _schedule_flush(self, delay: float) -> None:
+        """Garantit que la dernière valeur filtrée sera écrite au plus tard après `delay`."""
+        if self._flush_unsub is not None or self.hass is None:
+            return
+
+        @callback
+        def _flush(_now) -> None:
+            self._flush_unsub = None
+            self._write_state(self.native_value, time.monotonic())
+
+        self._flush_unsub = async_call_later(self.hass, max(delay, 0.0), _flush)
+
+    def _cancel_flush(self) -> None:
+        if self._flush_unsub is not None:
+            self._flush_unsub()
+            self._flush_unsub = None
+
+    async def async_will_remove_from_hass(self) -> None:
+        self._cancel_flush()
+        await super().async_will_remove_from_hass()
 
     # --- Valeur native --------------------------------------------------------
 
     @property
     def native_value(self):
-        value = self.coordinator.get_value(self._car_id, self.sensor_key)
-
-        f = _to_finite_float(value)
+        # Valeur déjà parsée à l'ingestion (cf. CarValues) : simple lecture de slot
+        f = self.coordinator.get_float(self._car_id, self.sensor_key)
         if f is not None:
             return round(f, 2)
 
@@ -391,49 +563,6 @@ class TorqueSensor(TorqueEntity, RestoreSensor):
         self._set_icon()
 
     def _set_icon(self) -> None:
-        self._attr_icon = DEFAULT_ICON
-
-        u = (self._attr_native_unit_of_measurement or "").strip().lower().replace(" ", "")
-        u = u.replace("kmh", "km/h").replace("kph", "km/h")
-
-        name = (self._attr_name or "")
-
-        speed_units = {"km/h", "mph", "m/s", "kn"}
-        distance_units = {"km", "mi", "m", "ft"}
-        fuel_units = {"l/100km", "mpg", "km/l", "l", "gal", "wh/km", "kwh/100km", "gph"}
-        time_units = {"s", "sec", "secs", "secondes", "min", "mins", "h", "hr", "hrs", "ms"}
-
-        if u in distance_units:
-            self._attr_icon = DISTANCE_ICON
-            return
-        if u in speed_units:
-            self._attr_icon = SPEED_ICON
-            return
-        if u in fuel_units:
-            self._attr_icon = FUEL_ICON
-            return
-        if u in time_units:
-            self._attr_icon = TIME_ICON
-            return
-
-        n = name.lower()
-        if re.search(r"\b(distance|kilometers?|miles?|kilom(è|e)tres?)\b", n, re.IGNORECASE):
-            self._attr_icon = DISTANCE_ICON
-            return
-        if re.search(r"\b(speed|vitesse)\b", n, re.IGNORECASE):
-            self._attr_icon = SPEED_ICON
-            return
-        if re.search(
-            r"\b(litre?s?|gallons?|fuel|carburant|essence|diesel)\b", n, re.IGNORECASE
-        ) or re.search(r"\b(l/100 ?km|mpg|km/l|wh/km|kwh/100km|gph)\b", n, re.IGNORECASE):
-            self._attr_icon = FUEL_ICON
-            return
-        if re.search(r"\b(time|min|sec|dur(é|e)e|ralenti|idle)\b", n, re.IGNORECASE):
-            self._attr_icon = TIME_ICON
-            return
-        if re.search(r"\b(autoroute|highway)\b", n, re.IGNORECASE):
-            self._attr_icon = HIGHWAY_ICON
-            return
-        if re.search(r"\b(ville|city)\b", n, re.IGNORECASE):
-            self._attr_icon = CITY_ICON
-            return
+        self._attr_icon = _classify_icon(
+            _normalize_unit(self._attr_native_unit_of_measurement), self._attr_name or ""
+        )
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""Session store for Torque Logger 2025."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Iterator, Optional
+import sys
+import time
+
+from .const import (
+    SESSION_TTL_SECONDS,
+    MAX_SESSIONS,
+    MAX_UNKNOWN_KEYS,
+    UNKNOWN_VALUE_MAX_LEN,
+    UNKNOWN_KEY_MAX_LEN,
+    DEDUP_WINDOW,
+)
+from .backfill import SessionClock
+
+
+def _sizeof(obj: Any) -> int:
+    """Taille approximative (octets) d'un objet et de son contenu (dict/list/tuple de scalaires)."""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_sizeof(k) + _sizeof(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(_sizeof(v) for v in obj)
+    return size
+
+
+class UnknownKeys:
+    """Clés de query inconnues d'une session : distinctes, bornées, avec compteurs.
+
+    Chaque clé (tronquée) garde son nombre d'occurrences et sa dernière valeur
+    (tronquée). Au-delà de `max_keys`, la clé la moins récemment vue est évincée.
+    """
+
+    __slots__ = ("_keys", "max_keys", "dropped")
+
+    def __init__(self, max_keys: int = MAX_UNKNOWN_KEYS) -> None:
+        # clé -> [occurrences, dernière valeur]
+        self._keys: OrderedDict[str, list] = OrderedDict()
+        self.max_keys = max_keys
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: str, value: str) -> None:
+        key = key[:UNKNOWN_KEY_MAX_LEN]
+        value = value[:UNKNOWN_VALUE_MAX_LEN]
+        entry = self._keys.get(key)
+        if entry is not None:
+            entry[0] += 1
+            entry[1] = value
+            self._keys.move_to_end(key)
+            return
+        self._keys[key] = [1, value]
+        if len(self._keys) > self.max_keys:
+            self._keys.popitem(last=False)
+            self.dropped += 1
+
+    def memory_footprint(self) -> int:
+        return sys.getsizeof(self) + _sizeof(self._keys)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "keys": {key: {"hits": hits, "last_value": value} for key, (hits, value) in self._keys.items()},
+            "dropped": self.dropped,
+        }
+
+
+class RecentUploads:
+    """Uploads récemment vus par session, pour écarter les renvois de Torque.
+
+    Clé : (`time`, empreinte de la query brute) dans la fenêtre des `window`
+    derniers uploads de la session ; au-delà de `max_sessions`, la session
+    la moins récemment vue est oubliée.
+    """
+
+    __slots__ = ("_seen", "window", "max_sessions", "stats")
+
+    def __init__(self, window: int = DEDUP_WINDOW, max_sessions: int = MAX_SESSIONS) -> None:
+        # session -> OrderedDict[(time, empreinte), None]
+        self._seen: OrderedDict[str, OrderedDict[tuple[str, int], None]] = OrderedDict()
+        self.window = window
+        self.max_sessions = max_sessions
+        self.stats: dict[str, int] = {"hits": 0, "misses": 0}
+
+    def seen(self, session: str, torque_time: str, raw: str) -> bool:
+        """True si cet upload a déjà été vu (doublon) ; sinon le mémorise."""
+        recent = self._seen.get(session)
+        if recent is None:
+            recent = self._seen[session] = OrderedDict()
+            while len(self._seen) > self.max_sessions:
+                self._seen.popitem(last=False)
+        else:
+            self._seen.move_to_end(session)
+
+        key = (torque_time, hash(raw))
+        if key in recent:
+            self.stats["hits"] += 1
+            return True
+
+        recent[key] = None
+        if len(recent) > self.window:
+            recent.popitem(last=False)
+        self.stats["misses"] += 1
+        return False
+
+    def diagnostics(self) -> dict[str, Any]:
+        return {"sessions": len(self._seen), "window": self.window, **self.stats}
+
+
+class SessionRecord:
+    """Buffer d'une session Torque (métadonnées et dernières valeurs brutes)."""
+
+    __slots__ = (
+        "session",
+        "profile",
+        "defaultUnit",
+        "fullName",
+        "shortName",
+        "value",
+        "unknown",
+        "time",
+        "last_seen",
+        "meta_fp",
+        "layout",
+        "clock",
+    )
+
+    def __init__(self, session: str, now: float) -> None:
+        self.session = session
+        self.profile: dict[str, str] = {}
+        self.defaultUnit: dict[str, str] = {}
+        self.fullName: dict[str, str] = {}
+        self.shortName: dict[str, str] = {}
+        self.value: dict[str, str] = {}
+        self.unknown = UnknownKeys()
+        self.time: int = 0
+        self.last_seen: float = now
+        # Empreinte des métadonnées ingérées et layout résolu (cf. api._SessionLayout)
+        self.meta_fp: Optional[int] = None
+        self.layout: Any = None
+        # Décalage d'horloge téléphone/HA (détection des échantillons en retard)
+        self.clock = SessionClock()
+
+    def memory_footprint(self) -> int:
+        """Taille approximative de la session en octets (hors layout partagé)."""
+        return (
+            sys.getsizeof(self)
+            + sum(
+                _sizeof(getattr(self, attr))
+                for attr in ("profile", "defaultUnit", "fullName", "shortName", "value")
+            )
+            + self.unknown.memory_footprint()
+        )
+
+
+class SessionStore:
+    """Sessions Torque en ordre LRU, avec index profil id -> nom du véhicule.
+
+    - `touch` crée/rafraîchit une session en O(1) et évince la plus ancienne
+      au-delà de `max_sessions` ;
+    - `purge_expired` ne visite que les sessions expirées (en tête du LRU) ;
+    - `vehicle_name` résout le nom d'un profil sans parcourir les sessions.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = MAX_SESSIONS,
+        ttl: float = SESSION_TTL_SECONDS,
+    ) -> None:
+        self._sessions: OrderedDict[str, SessionRecord] = OrderedDict()
+        # profil id -> {session -> nom du véhicule} (session nommée la plus récente en dernier)
+        self._names_by_id: dict[str, dict[str, str]] = {}
+        self.max_sessions = max_sessions
+        self.ttl = float(ttl)
+        # Compteurs d'éviction (exposés via diagnostics)
+        self.stats: dict[str, int] = {
+            "sessions_evicted_ttl": 0,
+            "sessions_evicted_lru": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session: object) -> bool:
+        return session in self._sessions
+
+    def __getitem__(self, session: str) -> SessionRecord:
+        return self._sessions[session]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sessions)
+
+    def get(self, session: str) -> Optional[SessionRecord]:
+        return self._sessions.get(session)
+
+    def touch(self, session: str, now: Optional[float] = None) -> SessionRecord:
+        """Retourne la session (créée si besoin) et la marque comme la plus récente."""
+        now = time.time() if now is None else now
+        rec = self._sessions.get(session)
+        if rec is None:
+            rec = self._sessions[session] = SessionRecord(session, now)
+            # Plafond du nombre de sessions : éviction LRU en O(1)
+            while len(self._sessions) > self.max_sessions:
+                _, evicted = self._sessions.popitem(last=False)
+                self._forget(evicted)
+                self.stats["sessions_evicted_lru"] += 1
+        else:
+            rec.last_seen = now
+            self._sessions.move_to_end(session)
+        return rec
+
+    def update_profile(self, rec: SessionRecord, profile: dict[str, str]) -> None:
+        """Fusionne le profil reçu et tient à jour l'index id -> nom."""
+        previous_id = rec.profile.get("id")
+        rec.profile.update(profile)
+        name = rec.profile.get("Name")
+        profile_id = rec.profile.get("id")
+        if previous_id is not None and previous_id != profile_id:
+            self._unindex(previous_id, rec.session)
+        if name and profile_id is not None:
+            names = self._names_by_id.setdefault(profile_id, {})
+            names.pop(rec.session, None)
+            names[rec.session] = name
+
+    def vehicle_name(self, profile_id: Optional[str]) -> Optional[str]:
+        """Nom du véhicule connu pour ce profil id (session nommée la plus récente), en O(1)."""
+        if profile_id is None:
+            return None
+        names = self._names_by_id.get(profile_id)
+        return next(reversed(names.values())) if names else None
+
+    def purge_expired(self, now: Optional[float] = None) -> int:
+        """Purge les sessions inactives depuis plus de `ttl` secondes."""
+        now = time.time() if now is None else now
+        deadline = now - self.ttl
+        purged = 0
+        while self._sessions:
+            rec = next(iter(self._sessions.values()))
+            if rec.last_seen > deadline:
+                break
+            self._sessions.popitem(last=False)
+            self._forget(rec)
+            purged += 1
+        self.stats["sessions_evicted_ttl"] += purged
+        return purged
+
+    def _forget(self, rec: SessionRecord) -> None:
+        profile_id = rec.profile.get("id")
+        if profile_id is not None:
+            self._unindex(profile_id, rec.session)
+
+    def _unindex(self, profile_id: str, session: str) -> None:
+        """Retire une session de l'index ; l'id n'est oublié qu'une fois sans session."""
+        names = self._names_by_id.get(profile_id)
+        if names is None:
+            return
+        names.pop(session, None)
+        if not names:
+            del self._names_by_id[profile_id]
+
+    def memory_footprint(self) -> dict[str, int]:
+        """Taille approximative (octets) de chaque session."""
+        return {key: rec.memory_footprint() for key, rec in self._sessions.items()}
+
+    def diagnostics(self) -> dict[str, Any]:
+        """État du store pour les diagnostics."""
+        footprint = self.memory_footprint()
+        return {
+            "sessions": len(self._sessions),
+            "profiles_indexed": len(self._names_by_id),
+            "stats": dict(self.stats),
+            "memory_bytes": sum(footprint.values()),
+            "memory_bytes_per_session": footprint,
+            "unknown_keys": {
+                key: rec.unknown.as_dict() for key, rec in self._sessions.items() if len(rec.unknown)
+            },
+        }
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""Typed per-vehicle value store for Torque Logger 2025."""
+from __future__ import annotations
+
+from array import array
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, NamedTuple, Optional
+import math
+import sys
+
+def _finite_float(value: Any) -> Optional[float]:
+    """float fini ou None (filtre NaN/±inf et erreurs de cast)."""
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        f = float(value)
+    except (ValueError, TypeError):
+        return None
+    return f if math.isfinite(f) else None
+
+
+@lru_cache(maxsize=8)
+def parse_unit_thresholds(text: Optional[str]) -> Mapping[str, float]:
+    """Seuils par unité saisis en options : "°C=0.5; rpm=50" -> {"°C": 0.5, "rpm": 50.0}.
+
+    Virgule décimale acceptée ; lève ValueError sur une entrée mal formée.
+    """
+    thresholds: dict[str, float] = {}
+    for entry in (text or "").replace("\n", ";").split(";"):
+        if not entry.strip():
+            continue
+        unit, sep, raw = entry.partition("=")
+        unit = unit.strip()
+        value = float(raw.strip().replace(",", ".")) if sep else math.nan
+        if not unit or not math.isfinite(value) or value < 0:
+            raise ValueError(f"invalid threshold: {entry.strip()!r}")
+        thresholds[unit] = value
+    return MappingProxyType(thresholds)
+
+
+class CarSnapshot(NamedTuple):
+    """État publié d'une voiture, immuable et versionné.
+
+    `profile` et `meta` sont des vues en lecture seule, réutilisées d'une
+    publication à l'autre tant qu'elles ne changent pas (comparaison par
+    identité possible) ; les valeurs sont dans le CarValues de la voiture,
+    chaque clé portant la version de sa dernière modification.
+    """
+
+    version: int
+    profile: Mapping[str, str]
+    meta: Mapping[str, Mapping[str, str]]
+    time: int
+
+
+class CarValues:
+    """Dernières valeurs d'une voiture, parsées une seule fois à l'ingestion.
+
+    - une entrée par clé (slot) ; valeurs numériques dans un `array('d')`, avec
+      un bitmap de validité (un bit par slot) ;
+    - valeurs textuelles : dict séparé ;
+    - version de la dernière modification de chaque slot (`array('Q')`).
+    La lecture d'un état devient une simple lecture de slot.
+    """
+
+    __slots__ = ("_index", "_num", "_valid", "_text", "_versions")
+
+    def __init__(self) -> None:
+        self._index: dict[str, int] = {}  # clé -> slot
+        self._num = array("d")
+        self._valid = bytearray()
+        self._text: dict[str, str] = {}
+        self._versions = array("Q")
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def _slot(self, key: str) -> int:
+        idx = self._index.get(key)
+        if idx is None:
+            idx = self._index[key] = len(self._num)
+            self._num.append(0.0)
+            self._versions.append(0)
+            if idx % 8 == 0:
+                self._valid.append(0)
+        return idx
+
+    def _is_valid(self, idx: Optional[int]) -> bool:
+        return idx is not None and bool(self._valid[idx >> 3] & (1 << (idx & 7)))
+
+    def set(self, key: str, value: Any, version: int = 0) -> bool:
+        """Enregistre une valeur ; True (et slot marqué `version`) si elle a changé."""
+        idx = self._slot(key)
+        f = _finite_float(value)
+        if f is not None:
+            if self._is_valid(idx) and self._num[idx] == f:
+                return False
+            self._num[idx] = f
+            self._valid[idx >> 3] |= 1 << (idx & 7)
+            self._text.pop(key, None)
+            self._versions[idx] = version
+            return True
+
+        was_numeric = self._is_valid(idx)
+        if was_numeric:
+            self._valid[idx >> 3] &= ~(1 << (idx & 7))
+
+        if value is None:
+            changed = self._text.pop(key, None) is not None or was_numeric
+        else:
+            text = str(value)
+            changed = was_numeric or self._text.get(key) != text
+            self._text[key] = text
+        if changed:
+            self._versions[idx] = version
+        return changed
+
+    def update(self, items: Iterable[tuple[str, Any]], version: int = 0) -> set[str]:
+        """Enregistre des couples (clé, valeur) ; retourne les clés modifiées."""
+        set_value = self.set
+        return {key for key, value in items if set_value(key, value, version)}
+
+    def get(self, key: str) -> Any:
+        """Valeur de la clé : float si numérique, sinon texte (ou None)."""
+        idx = self._index.get(key)
+        if self._is_valid(idx):
+            return self._num[idx]  # type: ignore[index]
+        return self._text.get(key)
+
+    def get_float(self, key: str) -> Optional[float]:
+        """Valeur numérique de la clé, ou None."""
+        idx = self._index.get(key)
+        if self._is_valid(idx):
+            return self._num[idx]  # type: ignore[index]
+        return None
+
+    def version_of(self, key: str) -> int:
+        """Version de la dernière modification de la clé (0 si inconnue)."""
+        idx = self._index.get(key)
+        return 0 if idx is None else self._versions[idx]
+
+    def memory_footprint(self) -> int:
+        """Taille approximative en octets (index, slots, bitmap, versions, textes)."""
+        return (
+            sys.getsizeof(self)
+            + sys.getsizeof(self._index)
+            + sys.getsizeof(self._num)
+            + sys.getsizeof(self._valid)
+            + sys.getsizeof(self._versions)
+            + sys.getsizeof(self._text)
+            + sum(sys.getsizeof(v) for v in self._text.values())
+        )
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""Chargement de l'intégration pour les scripts de benchmark.
+
+Avec Home Assistant installé (environnement de dev), l'intégration est
+importée telle quelle. Sans HA, des modules de remplacement minimaux sont
+installés (uniquement pour ces scripts) afin de mesurer le code de
+l'intégration lui-même ; les registres sont de toute façon simulés par
+chaque benchmark.
+"""
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import enum
+import importlib
+import importlib.abc
+import importlib.machinery
+import re
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.torque_logger_2025"
+
+
+def _module(name: str, **attrs) -> types.ModuleType:
+    mod = types.ModuleType(name)
+    mod.__dict__.update(attrs)
+    mod.__path__ = []  # type: ignore[attr-defined]
+    sys.modules[name] = mod
+    return mod
+
+
+class _AutoModule(types.ModuleType):
+    """Module dont les attributs absents sont créés à la demande (classes, constantes, fonctions)."""
+
+    def __getattr__(self, name: str):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        if name.isupper():
+            value = name.lower()
+        elif name[:1].isupper():
+            value = type(
+                name,
+                (),
+                {
+                    "__init__": lambda self, *a, **k: None,
+                    "__class_getitem__": classmethod(lambda cls, item: cls),
+                },
+            )
+        else:
+            value = lambda *a, **k: None  # noqa: E731
+        setattr(self, name, value)
+        return value
+
+
+class _AutoFinder(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    def find_spec(self, name, path, target=None):
+        if name.startswith(("homeassistant", "voluptuous")) and name not in sys.modules:
+            return importlib.machinery.ModuleSpec(name, self, is_package=True)
+        return None
+
+    def create_module(self, spec):
+        mod = _AutoModule(spec.name)
+        mod.__path__ = []
+        return mod
+
+    def exec_module(self, module):
+        pass
+
+
+def _install_stand_ins() -> None:
+    """Remplaçants minimaux de HA / aiohttp (benchmarks uniquement)."""
+
+    def slugify(text: str, separator: str = "_") -> str:
+        return re.sub(r"[^a-z0-9]+", separator, text.lower()).strip(separator)
+
+    class Response:
+        def __init__(self, text: str = "", status: int = 200) -> None:
+            self.text = text
+            self.status = status
+
+    class HTTPBadRequest(Exception):
+        def __init__(self, text: str = "") -> None:
+            super().__init__(text)
+
+    web = _module("aiohttp.web", Response=Response, HTTPBadRequest=HTTPBadRequest, Request=object)
+    _module("aiohttp", web=web)
+
+    class ConfigEntryState(enum.Enum):
+        LOADED = "loaded"
+        NOT_LOADED = "not_loaded"
+
+    class DataUpdateCoordinator:
+        def __init__(self, hass, logger, name=None, **kwargs) -> None:
+            self.hass = hass
+            self.data = None
+
+        def __class_getitem__(cls, item):
+            return cls
+
+        def async_update_listeners(self) -> None:
+            pass
+
+        def async_add_listener(self, update_callback, context=None):
+            return lambda: None
+
+    class CoordinatorEntity:
+        def __init__(self, coordinator, context=None) -> None:
+            self.coordinator = coordinator
+
+        def __class_getitem__(cls, item):
+            return cls
+
+    def call_later(hass, delay, action):
+        return asyncio.get_running_loop().call_later(delay, action, None).cancel
+
+    _module("homeassistant")
+    _module("homeassistant.components")
+    _module("homeassistant.components.http", HomeAssistantView=object, KEY_HASS="hass")
+    util = _module("homeassistant.util", slugify=slugify)
+    util.dt = _module(
+        "homeassistant.util.dt",
+        utc_from_timestamp=lambda ts: dt.datetime.fromtimestamp(ts, dt.timezone.utc),
+    )
+    _module("homeassistant.config_entries", ConfigEntryState=ConfigEntryState, ConfigEntry=object)
+    _module("homeassistant.core", HomeAssistant=object, callback=lambda f: f, CALLBACK_TYPE=object)
+    _module("homeassistant.helpers")
+    _module(
+        "homeassistant.helpers.event",
+        async_call_later=call_later,
+        async_track_time_interval=lambda *a, **k: (lambda: None),
+    )
+    _module(
+        "homeassistant.helpers.update_coordinator",
+        DataUpdateCoordinator=DataUpdateCoordinator,
+        CoordinatorEntity=CoordinatorEntity,
+    )
+    _module("homeassistant.helpers.entity", DeviceInfo=dict)
+    sys.meta_path.append(_AutoFinder())
+
+
+def load(*modules: str, root: Path = ROOT) -> list[types.ModuleType]:
+    """Importe les modules de l'intégration demandés (ex. "api", "sensor").
+
+    `root` : arborescence contenant custom_components/ (par défaut ce dépôt).
+    """
+    try:
+        import homeassistant.core  # noqa: F401
+    except ImportError:
+        _install_stand_ins()
+    if str(root) not in sys.path:
+        sys.path.insert(0, str(root))
+    return [importlib.import_module(f"{PACKAGE}.{name}") for name in modules]
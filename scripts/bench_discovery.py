@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""Benchmark de la découverte d'entités en début de session (coordinator.add_entities).
+
+Simule `--vehicles` voitures dont les PID arrivent au fil des uploads
+(`--per-upload` nouveaux PID toutes les `--interval` s, horloge simulée)
+jusqu'à `--pids` capteurs, GPS compris. Compare le nombre d'appels
+d'ajout d'entités (écritures au registre) et le temps de découverte :
+ancienne création immédiate à chaque upload contre création groupée et
+debouncée par voiture.
+
+    python scripts/bench_discovery.py [--vehicles 5] [--pids 60] [--per-upload 3] [--interval 0.5]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+from _bench_env import load
+
+coordinator_mod, const, sensor = load("coordinator", "const", "sensor")
+
+
+class VirtualTimers:
+    """Remplace async_call_later : minuteries déclenchées par l'horloge simulée."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.timers: list[list] = []
+
+    def call_later(self, hass, delay, action):
+        timer = [self.now + delay, action, True]
+        self.timers.append(timer)
+
+        def cancel() -> None:
+            timer[2] = False
+
+        return cancel
+
+    def advance(self, to: float) -> None:
+        self.now = to
+        due = [t for t in self.timers if t[0] <= to]
+        self.timers = [t for t in self.timers if t[0] > to]
+        for _when, action, active in sorted(due, key=lambda t: t[0]):
+            if active:
+                action(to)
+
+
+def build_session(pids: int, per_upload: int) -> list[tuple[dict, list]]:
+    """Méta cumulées et valeurs de chaque upload (nouveaux PID à chaque fois)."""
+    keys = [k for k in const.TORQUE_CODES if k not in (const.TORQUE_GPS_LAT, const.TORQUE_GPS_LON)][:pids]
+    uploads = []
+    meta: dict = {}
+    for start in range(0, len(keys) + per_upload, per_upload):
+        for key in keys[start:start + per_upload]:
+            desc = const.TORQUE_CODES[key]
+            meta[key] = {"name": desc.get("fullName", key), "unit": desc.get("unit") or "%"}
+        items = [(key, "1.0") for key in meta]
+        if start >= len(keys) // 2:
+            # Fix GPS en cours de session
+            items += [(const.TORQUE_GPS_LAT, "48.85"), (const.TORQUE_GPS_LON, "2.35")]
+        uploads.append((dict(meta), items))
+    return uploads
+
+
+def baseline_add_entities(coord, snapshot, counter: dict) -> None:
+    """Ancienne découverte : parcours complet des méta et ajout immédiat à chaque upload."""
+    car_name = snapshot.profile["Name"]
+    car_id = coordinator_mod.slugify(car_name)
+    device = coordinator_mod.DeviceInfo(
+        identifiers={(const.DOMAIN, car_id)},
+        manufacturer="Torque",
+        model=car_name,
+        name=car_name,
+        sw_version=snapshot.profile.get("version"),
+    )
+    new_sensors = []
+    for key, meta in snapshot.meta.items():
+        if key in (const.TORQUE_GPS_LAT, const.TORQUE_GPS_LON) or f"{car_id}:{key}" in coord.tracked:
+            continue
+        name = meta.get("name") or key
+        unit = (meta.get("unit") or "").strip()
+        if (unit == "" and not coord._is_textual_sensor(name)) or name == key:
+            continue
+        new_sensors.append(sensor.TorqueSensor(coord, coord.entry, key, device))
+    values = coord.values.get(car_id) or ()
+    if const.TORQUE_GPS_LAT in values and f"{car_id}:{const.ENTITY_GPS}" not in coord.tracked:
+        coord.tracked.add(f"{car_id}:{const.ENTITY_GPS}")
+        counter["add_calls"] += 1
+        counter["entities_added"] += 1
+    if new_sensors:
+        coord.tracked.update(f"{car_id}:{s.sensor_key}" for s in new_sensors)
+        counter["add_calls"] += 1
+        counter["entities_added"] += len(new_sensors)
+    # Ancien log de toutes les clés suivies à chaque upload
+    ", ".join(sorted(coord.tracked))
+
+
+async def run(args, batched: bool) -> tuple[dict, float]:
+    timers = VirtualTimers()
+    coordinator_mod.async_call_later = timers.call_later
+    entry = SimpleNamespace(entry_id="entry1", options={}, data={})
+    coord = coordinator_mod.TorqueLoggerCoordinator(SimpleNamespace(), None, entry)
+    coord.async_add_sensor = lambda entities: None
+    coord.async_add_device_tracker = lambda entities: None
+    counter = {"add_calls": 0, "entities_added": 0}
+    session = build_session(args.pids, args.per_upload)
+
+    elapsed = 0.0
+    for n, (meta, items) in enumerate(session):
+        timers.advance(n * args.interval)
+        for v in range(args.vehicles):
+            profile = {"Name": f"Car {v}", "version": "9"}
+            snapshot = coord.publish(profile, n * 1000, meta, items)
+            start = time.perf_counter()
+            if batched:
+                await coord.add_entities(snapshot, tuple(meta))
+            else:
+                baseline_add_entities(coord, snapshot, counter)
+            elapsed += time.perf_counter() - start
+    timers.advance(len(session) * args.interval + const.ENTITY_DISCOVERY_DEBOUNCE_SECONDS)
+    if batched:
+        counter = dict(coord.stats)
+    return counter, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=5)
+    parser.add_argument("--pids", type=int, default=60)
+    parser.add_argument("--per-upload", type=int, default=3)
+    parser.add_argument("--interval", type=float, default=0.5)
+    args = parser.parse_args()
+
+    print(
+        f"{args.vehicles} voitures, {args.pids} PID (+ GPS), {args.per_upload} nouveaux PID "
+        f"toutes les {args.interval} s ; debounce {const.ENTITY_DISCOVERY_DEBOUNCE_SECONDS} s"
+    )
+    for label, batched in (("avant (ajout à chaque upload)", False), ("après (groupé + debounce)", True)):
+        counter, elapsed = asyncio.run(run(args, batched))
+        print(
+            f"{label:32s} appels d'ajout {counter['add_calls']:5d}   entités {counter['entities_added']:5d}"
+            f"   découverte {elapsed * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Benchmark du temps d'import de l'intégration (chargement dans la boucle HA).
+
+Chaque mesure importe `api` dans un interpréteur neuf. L'arborescence actuelle
+est comparée à une révision git de référence (par défaut : avant
+l'initialisation différée du registre pint et des tables de libellés), extraite
+dans un répertoire temporaire. Nécessite pint et git.
+
+    python scripts/bench_import.py [--baseline REV] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+
+from _bench_env import ROOT
+
+SCRIPTS = Path(__file__).resolve().parent
+
+_PROBE = """
+import sys, time
+sys.path.insert(0, {scripts!r})
+from pathlib import Path
+from _bench_env import load
+start = time.perf_counter()
+(api,) = load("api", root=Path({root!r}))
+print(time.perf_counter() - start)
+"""
+
+
+def import_time(root: Path) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(scripts=str(SCRIPTS), root=str(root))],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+def export_revision(rev: str, dest: Path) -> None:
+    archive = subprocess.run(
+        ["git", "-C", str(ROOT), "archive", rev, "custom_components"],
+        check=True,
+        capture_output=True,
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(dest)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--baseline",
+        default="HEAD^{/Defer pint registry}~1",
+        help="révision de référence (défaut : parent du commit d'initialisation différée)",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        export_revision(args.baseline, Path(tmp))
+        results = {}
+        for label, root in (("avant (" + args.baseline + ")", Path(tmp)), ("après (arborescence)", ROOT)):
+            timings = [import_time(root) for _ in range(args.repeat)]
+            results[label] = statistics.median(timings)
+            print(f"{label:40s} médiane {results[label] * 1000:8.1f} ms  (min {min(timings) * 1000:.1f} ms)")
+    before, after = results.values()
+    print(f"gain : x{before / after:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""Benchmark du parsing des uploads Torque (TorqueReceiveDataView.parse_fields).
+
+Compare le parseur actuel (query brute, aiguillage par préfixe, métadonnées
+ré-ingérées seulement si elles changent) à l'ancien (`request.query` décodé
+puis boucle de `startswith` indexant le buffer de session à chaque clé).
+
+Par défaut, une session Torque type est générée : un upload de métadonnées
+(userShortName/userFullName/defaultUnit/userUnit pour chaque PID) puis des
+uploads de valeurs seules. `--file` rejoue à la place des query strings
+enregistrées (une par ligne, ex. extraites d'un log d'accès).
+
+    python scripts/bench_parse.py [--pids 40] [--uploads 500] [--repeat 5] [--file uploads.txt]
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from types import SimpleNamespace
+from urllib.parse import parse_qsl, urlencode
+
+from _bench_env import load
+
+api, const, session_mod = load("api", "const", "session")
+
+
+def build_uploads(pids: int, uploads: int) -> list[str]:
+    """Session synthétique au format Torque (1 upload de métadonnées + N de valeurs)."""
+    keys = list(const.TORQUE_CODES)[:pids]
+    common = {
+        "eml": "driver@example.com",
+        "v": "9",
+        "session": "1729230000000",
+        "id": "3f2a9c0d5b1e4e7f8a6b2c1d0e9f8a7b",
+    }
+    meta = dict(common, time="1729230000000", profileName="My Car", profileFuelType="0")
+    for pid in keys:
+        desc = const.TORQUE_CODES[pid]
+        meta[f"userUnit{pid}"] = desc.get("unit", "")
+        meta[f"userShortName{pid}"] = desc.get("shortName", pid)
+        meta[f"userFullName{pid}"] = desc.get("fullName", pid)
+        meta[f"defaultUnit{pid}"] = desc.get("unit", "")
+    result = [urlencode(meta)]
+    for n in range(uploads):
+        values = dict(common, time=str(1729230000000 + (n + 1) * 1000))
+        for i, pid in enumerate(keys):
+            values[f"k{pid.lstrip('0') or '0'}"] = f"{(n * 7 + i) % 250 + 0.5:.2f}"
+        result.append(urlencode(values))
+    return result
+
+
+def baseline_parse_fields(data: dict, qdata) -> str:
+    """Ancien parse_fields (avant l'aiguillage par préfixe), sans le filtrage email."""
+    session: str = qdata.get("session")
+    if session not in data:
+        data[session] = {
+            "profile": {},
+            "unit": {},
+            "defaultUnit": {},
+            "fullName": {},
+            "shortName": {},
+            "value": {},
+            "unknown": [],
+            "time": 0,
+            "last_seen": time.time(),
+        }
+    else:
+        data[session]["last_seen"] = time.time()
+
+    for key, value in qdata.items():
+        if key.startswith("userUnit"):
+            continue
+        if key.startswith("userShortName"):
+            data[session]["shortName"][key[13:]] = value
+            continue
+        if key.startswith("userFullName"):
+            data[session]["fullName"][key[12:]] = value
+            continue
+        if key.startswith("defaultUnit"):
+            data[session]["defaultUnit"][key[11:]] = value
+            continue
+        if key.startswith("k"):
+            item = key[1:]
+            if len(item) == 1:
+                item = "0" + item
+            data[session]["value"][item] = value
+            continue
+        if key.startswith("profile"):
+            data[session]["profile"][key[7:]] = value
+            continue
+        if key == "eml":
+            data[session]["profile"]["email"] = value
+            continue
+        if key == "time":
+            try:
+                data[session]["time"] = int(value)
+            except (ValueError, TypeError):
+                data[session]["time"] = 0
+            continue
+        if key == "v":
+            data[session]["profile"]["version"] = value
+            continue
+        if key == "session":
+            continue
+        if key == "id":
+            data[session]["profile"]["id"] = value
+            continue
+        data[session]["unknown"].append({"key": key, "value": value})
+    return session
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pids", type=int, default=40)
+    parser.add_argument("--uploads", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--file", help="query strings enregistrées, une par ligne")
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, encoding="utf-8") as fh:
+            uploads = [line.strip().lstrip("?") for line in fh if line.strip()]
+    else:
+        uploads = build_uploads(args.pids, args.uploads)
+
+    def run_baseline() -> None:
+        data: dict = {}
+        for raw in uploads:
+            # Équivalent du décodage de `request.query` par aiohttp
+            baseline_parse_fields(data, dict(parse_qsl(raw, keep_blank_values=True)))
+
+    def run_current() -> None:
+        view = api.TorqueReceiveDataView()
+        coordinator = SimpleNamespace(entry=SimpleNamespace(entry_id="entry1"))
+        view.add_route("entry1", "", session_mod.SessionStore(), coordinator, False, "en")
+        route = view.routes[""]
+        for raw in uploads:
+            view.parse_fields(raw, route)
+
+    print(f"{len(uploads)} uploads ({'enregistrés' if args.file else f'{args.pids} PID, synthétiques'})")
+    results = {}
+    for label, func in (("avant (request.query + startswith)", run_baseline), ("après (aiguillage par préfixe)", run_current)):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        results[label] = statistics.median(timings)
+        per_upload = results[label] / len(uploads) * 1e6
+        print(f"{label:36s} médiane {results[label] * 1000:8.1f} ms  ({per_upload:.1f} µs/upload)")
+    before, after = results.values()
+    print(f"gain : x{before / after:.2f}")
+
+
+if __name__ == "__main__":
+    main()
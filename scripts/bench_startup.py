@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""Benchmark de la restauration des capteurs au démarrage (sensor.async_setup_entry).
+
+Registres d'entités / d'appareils simulés : `--vehicles` véhicules de
+`--sensors` capteurs chacun (par défaut 50 × 200). Compare la restauration
+actuelle (index en une passe des entités de l'entrée) à l'ancienne boucle
+(parcours de tout le registre d'entités pour chaque appareil).
+
+    python scripts/bench_startup.py [--vehicles 50] [--sensors 200] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+
+from _bench_env import load
+
+(sensor,) = load("sensor")
+DOMAIN = sensor.DOMAIN
+SENSOR = sensor.SENSOR
+
+
+class FakeEntityRegistry:
+    def __init__(self, entries) -> None:
+        self.entities = {entry.entity_id: entry for entry in entries}
+        # Comme HA : index par entrée de configuration
+        self.by_config_entry: dict[str, list] = {}
+        for entry in entries:
+            self.by_config_entry.setdefault(entry.config_entry_id, []).append(entry)
+
+
+class FakeDeviceRegistry:
+    def __init__(self, devices) -> None:
+        self.devices = {device.id: device for device in devices}
+
+    def async_get(self, device_id):
+        return self.devices.get(device_id)
+
+
+def build_registries(entry_id: str, vehicles: int, sensors: int):
+    devices, entities = [], []
+    for v in range(vehicles):
+        car_id = f"car_{v}"
+        device = SimpleNamespace(
+            id=f"dev_{v}",
+            identifiers={(DOMAIN, car_id)},
+            manufacturer="Torque",
+            model=f"Car {v}",
+            name=f"Car {v}",
+            sw_version=None,
+            config_entries={entry_id},
+        )
+        devices.append(device)
+        for s in range(sensors):
+            entities.append(
+                SimpleNamespace(
+                    entity_id=f"sensor.car_{v}_pid_{s}",
+                    domain=SENSOR,
+                    device_id=device.id,
+                    unique_id=f"{DOMAIN}_{entry_id}_{car_id}_pid_{s}",
+                    config_entry_id=entry_id,
+                )
+            )
+    return FakeEntityRegistry(entities), FakeDeviceRegistry(devices)
+
+
+def baseline_restore(coordinator, entry, ent_reg, dev_reg, async_add_entities) -> None:
+    """Ancienne restauration : pour chaque appareil, parcours de tout le registre d'entités."""
+    devices = [
+        device
+        for device in dev_reg.devices.values()
+        if any(ident[0] == DOMAIN for ident in device.identifiers)
+    ]
+    to_add = []
+    for device in devices:
+        car_id = next(ident[1] for ident in device.identifiers if ident[0] == DOMAIN)
+        device_info = {
+            "identifiers": device.identifiers,
+            "manufacturer": device.manufacturer,
+            "model": device.model,
+            "name": device.name,
+            "sw_version": device.sw_version,
+        }
+        prefix = f"{DOMAIN}_{entry.entry_id}_{car_id}_"
+        to_add.extend(
+            sensor.TorqueSensor(coordinator, entry, er_ent.unique_id[len(prefix):], device_info)
+            for er_ent in ent_reg.entities.values()
+            if er_ent.device_id == device.id
+            and er_ent.domain == SENSOR
+            and er_ent.unique_id
+            and er_ent.unique_id.startswith(prefix)
+        )
+    if to_add:
+        async_add_entities(to_add)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vehicles", type=int, default=50)
+    parser.add_argument("--sensors", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    entry = SimpleNamespace(entry_id="entry1", options={}, data={})
+    ent_reg, dev_reg = build_registries(entry.entry_id, args.vehicles, args.sensors)
+
+    # Registres simulés branchés sur les helpers utilisés par sensor.py
+    sensor.er.async_get = lambda hass: ent_reg
+    sensor.er.async_entries_for_config_entry = lambda reg, entry_id: reg.by_config_entry.get(entry_id, [])
+    sensor.dr.async_get = lambda hass: dev_reg
+
+    def fresh():
+        # Sous-ensemble du coordinator lu par TorqueSensor à la construction
+        coordinator = SimpleNamespace(
+            entry=entry, tracked=set(), async_add_sensor=None, get_meta=lambda car_id: {}
+        )
+        hass = SimpleNamespace(data={DOMAIN: {entry.entry_id: {"coordinator": coordinator}}})
+        added: list = []
+        return coordinator, hass, added.extend, added
+
+    def run_current() -> int:
+        _, hass, add, added = fresh()
+        asyncio.run(sensor.async_setup_entry(hass, entry, add))
+        return len(added)
+
+    def run_baseline() -> int:
+        coordinator, _, add, added = fresh()
+        baseline_restore(coordinator, entry, ent_reg, dev_reg, add)
+        return len(added)
+
+    total = args.vehicles * args.sensors
+    print(f"{args.vehicles} véhicules × {args.sensors} capteurs = {total} entités")
+    for label, func in (("avant (boucle par appareil)", run_baseline), ("après (index une passe)", run_current)):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            restored = func()
+            timings.append(time.perf_counter() - start)
+            assert restored == total, (label, restored)
+        print(f"{label:30s} médiane {statistics.median(timings) * 1000:9.1f} ms  (min {min(timings) * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""Micro-benchmark des conversions d'unités impériales (nécessite pint).
+
+Compare, par couple d'unités, l'ancienne conversion (Quantity pint + `.to()`
+à chaque valeur) au convertisseur compilé et mis en cache (`_get_converter`) :
+couples de `imperial_units` et unités pression/débit/couple/puissance de const.py.
+
+    python scripts/bench_units.py [--values 2000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import statistics
+import time
+
+from _bench_env import load
+
+api, const = load("api", "const")
+
+PAIRS: list[tuple[str, str]] = [
+    *api.imperial_units.items(),
+    (const.DEFAULT_PRESSURE_METRIC, const.DEFAULT_PRESSURE_IMPERIAL),
+    (const.DEFAULT_FLOW_METRIC, const.DEFAULT_FLOW_IMPERIAL),
+    (const.DEFAULT_TORQUE_METRIC, const.DEFAULT_TORQUE_IMPERIAL),
+    (const.DEFAULT_POWER_METRIC, const.DEFAULT_POWER_IMPERIAL),
+]
+
+
+def baseline_convert(value: float, u_in: str, u_out: str) -> dict:
+    """Ancien `_pretty_convert_units` : Quantity pint à chaque valeur."""
+    ureg = api._get_ureg()
+    q_out = ureg.Quantity(value, api._unpretty_units(u_in)).to(api._unpretty_units(u_out))
+    return {"value": round(q_out.magnitude, 2), "unit": api._pretty_units(str(q_out.units))}
+
+
+def timed(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--values", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    values = [(i * 37 % 1000) / 7.0 for i in range(args.values)]
+    api._get_ureg()  # construction du registre hors mesure
+
+    print(f"{args.values} valeurs par couple ; temps médian par valeur")
+    print(f"{'couple':18s} {'avant (pint)':>14s} {'après (compilé)':>16s} {'gain':>8s}")
+    for u_in, u_out in PAIRS:
+        func, unit = api._get_converter(u_in, u_out)
+        # Même résultat que l'ancien chemin (valeur arrondie et unité affichée)
+        for value in values[:50]:
+            expected = baseline_convert(value, u_in, u_out)
+            assert math.isclose(round(func(value), 2), expected["value"], abs_tol=0.011), (u_in, u_out, value)
+            assert unit == expected["unit"], (u_in, u_out, unit, expected["unit"])
+
+        before = timed(lambda: [baseline_convert(v, u_in, u_out) for v in values], args.repeat)
+        after = timed(lambda: [round(func(v), 2) for v in values], args.repeat)
+        per_before = before / len(values) * 1e6
+        per_after = after / len(values) * 1e6
+        print(f"{u_in + ' -> ' + u_out:18s} {per_before:11.2f} µs {per_after:13.3f} µs {before / after:7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
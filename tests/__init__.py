@@ -0,0 +1 @@
+"""Tests for the Torque Logger 2025 integration."""
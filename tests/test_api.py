@@ -0,0 +1,116 @@
+"""Tests de la vue HTTP (extraction, parsing et ingestion des uploads Torque)."""
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+from homeassistant.components.http import KEY_HASS
+from homeassistant.config_entries import ConfigEntryState
+from yarl import URL
+
+from custom_components.torque_logger_2025.api import TorqueReceiveDataView, _parse_query
+from custom_components.torque_logger_2025.const import INGEST_BACKLOG_DEPTH, INGEST_BACKLOG_SECONDS
+from custom_components.torque_logger_2025.ingest import IngestItem
+from custom_components.torque_logger_2025.session import SessionStore
+
+
+def _view() -> TorqueReceiveDataView:
+    view = TorqueReceiveDataView()
+    coordinator = SimpleNamespace(entry=SimpleNamespace(state=ConfigEntryState.LOADED))
+    view.add_route("entry1", "", SessionStore(), coordinator, False, "en", reorder_window=0)
+    return view
+
+
+def _request(url: str) -> SimpleNamespace:
+    rel_url = URL(url)
+    hass = SimpleNamespace(async_create_background_task=lambda coro, name: coro.close())
+    return SimpleNamespace(
+        rel_url=rel_url,
+        query_string=rel_url.query_string,
+        headers={},
+        remote="192.0.2.1",
+        app={KEY_HASS: hass},
+    )
+
+
+def _get(view: TorqueReceiveDataView, url: str):
+    return asyncio.run(view.get(_request(url)))
+
+
+def test_get_decodes_query_once() -> None:
+    """Un `%xx` littéral (envoyé `%25xx`) n'est pas décodé deux fois."""
+    view = _view()
+    response = _get(
+        view,
+        "/api/torque_logger_2025?session=1&id=car&time=1000"
+        "&userFullNamekd=A%2541&userShortNamekd=Speed%20%2B&kd=50%25",
+    )
+    assert response.text == "OK!"
+
+    (item,) = view.queue.drain()
+    query = _parse_query(item.query)
+    query.decode_meta()
+    assert query.session == "1"
+    assert query.fullName["kd"] == "A%41"
+    assert query.shortName["kd"] == "Speed +"
+    assert query.value["0d"] == "50%"
+
+
+def _process(view: TorqueReceiveDataView, count: int, waited: float = 0.0) -> None:
+    view._async_publish_data = AsyncMock()
+    view._route_backfill = Mock()
+    route = view.routes[""]
+    received = time.monotonic() - waited
+    batch = [
+        IngestItem("car", f"session=1&id=car&time={1000 + i * 1000}&kd={i}", "en", received, route)
+        for i in range(count)
+    ]
+    asyncio.run(view._async_process_batch(batch))
+
+
+def test_uploads_published_in_order_without_backlog() -> None:
+    """Deux échantillons normaux traités ensemble : tous deux publiés, rien au backfill."""
+    view = _view()
+    _process(view, 2)
+    assert view._async_publish_data.await_count == 2
+    view._route_backfill.assert_not_called()
+    assert view.stats["bursts"] == 0
+
+
+def test_backlog_by_age_coalesces_intermediate_samples() -> None:
+    view = _view()
+    _process(view, 3, waited=INGEST_BACKLOG_SECONDS + 1)
+    assert view._async_publish_data.await_count == 1
+    assert view._route_backfill.call_count == 2
+    assert view.stats["samples_coalesced"] == 2
+
+
+def test_backlog_by_depth_coalesces_intermediate_samples() -> None:
+    view = _view()
+    _process(view, INGEST_BACKLOG_DEPTH)
+    assert view._async_publish_data.await_count == 1
+    assert view._route_backfill.call_count == INGEST_BACKLOG_DEPTH - 1
+
+
+def test_missing_session_answers_ok_and_is_counted() -> None:
+    """Torque réessaie tout upload sans `OK!` : un upload sans session n'est pas refusé en HTTP."""
+    view = _view()
+    response = _get(view, "/api/torque_logger_2025?id=car&time=1000&kd=1")
+    assert response.status == 200
+    assert response.text == "OK!"
+    assert view.rejected["missing_session"] == 1
+    assert len(view.queue) == 0
+
+
+def test_add_route_refuses_duplicate_account() -> None:
+    """Un compte déjà routé n'est pas remplacé par une autre entrée (même après normalisation)."""
+    view = TorqueReceiveDataView()
+    first = SimpleNamespace(entry=SimpleNamespace(state=ConfigEntryState.LOADED))
+    assert view.add_route("entry1", "Driver@Example.com", SessionStore(), first, False, "en")
+    assert not view.add_route("entry2", " driver@example.com ", SessionStore(), SimpleNamespace(), False, "en")
+    assert view.routes["driver@example.com"].entry_id == "entry1"
+    # Rechargement de la même entrée : sa route est remplacée
+    assert view.add_route("entry1", "driver@example.com", SessionStore(), first, True, "en")
+    assert view.routes["driver@example.com"].imperial
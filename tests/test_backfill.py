@@ -0,0 +1,69 @@
+"""Tests du backfill des échantillons en retard (horloge de session, import)."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from custom_components.torque_logger_2025.backfill import SessionClock, StatisticsBackfill
+from custom_components.torque_logger_2025.const import (
+    BACKFILL_STALE_SECONDS,
+    SESSION_CLOCK_STEADY_SECONDS,
+)
+
+NOW = 1_760_000_000.0
+ADD_STATISTICS = "homeassistant.components.recorder.statistics.async_add_external_statistics"
+
+
+def _ms(ts: float) -> int:
+    return int(ts * 1000)
+
+
+def test_replay_at_session_start_is_stale() -> None:
+    """Cache rejoué dans l'ordre en début de session : aucun échantillon n'est frais."""
+    clock = SessionClock()
+    results = [
+        clock.is_stale(_ms(NOW - 3600 + i), NOW + i * 0.01, BACKFILL_STALE_SECONDS)
+        for i in range(600)
+    ]
+    assert all(results)
+    assert clock.offset is None
+
+
+def test_fresh_sample_by_ha_clock() -> None:
+    clock = SessionClock()
+    assert not clock.is_stale(_ms(NOW - 2), NOW, BACKFILL_STALE_SECONDS)
+    assert clock.is_stale(_ms(NOW - 1200), NOW + 1, BACKFILL_STALE_SECONDS)
+
+
+def test_phone_clock_behind_is_learned() -> None:
+    """Téléphone en retard de ~10 min : référence retenue après une série stable."""
+    clock = SessionClock()
+    skew = 595
+    live = [
+        clock.is_stale(_ms(NOW + i - skew), NOW + i + 0.2, BACKFILL_STALE_SECONDS)
+        for i in range(SESSION_CLOCK_STEADY_SECONDS + 5)
+    ]
+    assert all(live[:SESSION_CLOCK_STEADY_SECONDS])
+    assert not any(live[SESSION_CLOCK_STEADY_SECONDS:])
+
+    # Cache vieux de 20 min par rapport à la session : toujours en retard
+    t = NOW + SESSION_CLOCK_STEADY_SECONDS + 5
+    assert clock.is_stale(_ms(t - skew - 1200), t, BACKFILL_STALE_SECONDS)
+    assert not clock.is_stale(_ms(t + 1 - skew), t + 1.2, BACKFILL_STALE_SECONDS)
+
+
+def test_flush_keeps_buckets_when_import_fails() -> None:
+    hass = SimpleNamespace(config=SimpleNamespace(components={"recorder"}))
+    backfill = StatisticsBackfill(hass)
+    assert backfill.add("car", "0d", "Speed", "km/h", _ms(NOW - 3600), 50)
+    assert backfill.add("car", "0c", "RPM", "rpm", _ms(NOW - 3600), 2000)
+
+    with patch(ADD_STATISTICS, side_effect=RuntimeError("database locked")):
+        assert backfill.async_flush() == 0
+    assert backfill.diagnostics()["pending_buckets"] == 2
+    assert backfill.stats["import_errors"] == 2
+
+    with patch(ADD_STATISTICS) as add_statistics:
+        assert backfill.async_flush() == 2
+    assert add_statistics.call_count == 2
+    assert backfill.diagnostics()["pending_buckets"] == 0
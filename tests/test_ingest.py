@@ -0,0 +1,68 @@
+"""Tests de la file d'ingestion et de la limitation de débit."""
+from __future__ import annotations
+
+from urllib.parse import parse_qsl
+
+from custom_components.torque_logger_2025.const import QUEUE_POLICY_COALESCE
+from custom_components.torque_logger_2025.ingest import IngestItem, IngestQueue, RateLimiter
+
+META_UPLOAD = (
+    "eml=a%40b.c&v=9&session=1&id=car&time=1000"
+    "&userShortNamekd=Speed&userFullNamekd=Vehicle%20Speed&defaultUnitkd=km%2Fh"
+)
+VALUES_UPLOAD = "eml=a%40b.c&v=9&session=1&id=car&time=2000&kd=42"
+
+
+def _fields(item: IngestItem) -> dict[str, str]:
+    return dict(parse_qsl(item.query))
+
+
+def test_rate_limiter_merges_held_uploads() -> None:
+    """Un upload de métadonnées retenu survit à l'upload de valeurs qui le suit."""
+    limiter = RateLimiter()
+    assert limiter.admit("src", IngestItem("car", "session=1&time=500&kd=1", "en"), 1.0, 1, now=0.0)
+    assert not limiter.admit("src", IngestItem("car", META_UPLOAD, "en"), 1.0, 1, now=0.1)
+    assert not limiter.admit("src", IngestItem("car", VALUES_UPLOAD, "fr"), 1.0, 1, now=0.2)
+
+    (held,) = limiter.pop_ready(now=2.0)
+    fields = _fields(held)
+    assert fields["userFullNamekd"] == "Vehicle Speed"
+    assert fields["userShortNamekd"] == "Speed"
+    assert fields["defaultUnitkd"] == "km/h"
+    assert fields["kd"] == "42"
+    assert fields["time"] == "2000"
+    assert held.lang == "fr"
+    assert limiter.stats["coalesced"] == 1
+
+
+def test_rate_limiter_merge_keeps_newest_time() -> None:
+    """Un upload plus ancien que celui retenu ne complète que les clés absentes."""
+    limiter = RateLimiter()
+    assert limiter.admit("src", IngestItem("car", "session=1&time=500", "en"), 1.0, 1, now=0.0)
+    assert not limiter.admit("src", IngestItem("car", VALUES_UPLOAD, "en"), 1.0, 1, now=0.1)
+    older = "session=1&id=car&time=1500&kd=7&userFullNamekd=Vehicle%20Speed"
+    assert not limiter.admit("src", IngestItem("car", older, "en"), 1.0, 1, now=0.2)
+
+    (held,) = limiter.pop_ready(now=2.0)
+    fields = _fields(held)
+    assert fields["time"] == "2000"
+    assert fields["kd"] == "42"
+    assert fields["userFullNamekd"] == "Vehicle Speed"
+
+
+def test_queue_coalesce_merges_in_place() -> None:
+    """File pleine (`coalesce`) : l'upload en attente garde sa place et ses métadonnées."""
+    queue = IngestQueue(maxsize=2)
+    queue.put(IngestItem("car", META_UPLOAD, "en"), QUEUE_POLICY_COALESCE)
+    queue.put(IngestItem("other", "session=2&id=other&time=1500&kc=3", "en"), QUEUE_POLICY_COALESCE)
+    queue.put(IngestItem("car", VALUES_UPLOAD, "en"), QUEUE_POLICY_COALESCE)
+
+    first, second = queue.drain()
+    assert first.key == "car"
+    assert second.key == "other"
+    fields = _fields(first)
+    assert fields["userFullNamekd"] == "Vehicle Speed"
+    assert fields["kd"] == "42"
+    assert fields["time"] == "2000"
+    assert queue.stats["coalesced"] == 1
+    assert queue.stats["dropped"] == 0
@@ -0,0 +1,30 @@
+"""Tests du filtrage des écritures d'état des capteurs (deadband)."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from custom_components.torque_logger_2025.const import (
+    CONF_DEADBAND_ABSOLUTE,
+    DEADBAND_DEFAULTS,
+)
+from custom_components.torque_logger_2025.sensor import TorqueSensor
+
+
+def _sensor(options: dict, unit: str) -> TorqueSensor:
+    entry = SimpleNamespace(entry_id="entry1", options=options, data={})
+    coordinator = SimpleNamespace(entry=entry, get_meta=lambda car_id: {})
+    device = {"identifiers": {("torque_logger_2025", "car")}, "name": "Car"}
+    sensor = TorqueSensor(coordinator, entry, "05", device)
+    sensor._attr_native_unit_of_measurement = unit
+    return sensor
+
+
+def test_absolute_override_is_scoped_to_its_unit() -> None:
+    options = {CONF_DEADBAND_ABSOLUTE: "°C=0.5"}
+    assert _sensor(options, "°C")._thresholds()[0] == 0.5
+    assert _sensor(options, "V")._thresholds() == DEADBAND_DEFAULTS["V"]
+    assert _sensor(options, "rpm")._thresholds() == DEADBAND_DEFAULTS["rpm"]
+
+
+def test_legacy_global_absolute_override_is_ignored() -> None:
+    assert _sensor({CONF_DEADBAND_ABSOLUTE: 0.5}, "V")._thresholds() == DEADBAND_DEFAULTS["V"]
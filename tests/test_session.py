@@ -0,0 +1,53 @@
+"""Tests du stockage des sessions Torque."""
+from __future__ import annotations
+
+from custom_components.torque_logger_2025.const import (
+    MAX_UNKNOWN_KEYS,
+    UNKNOWN_KEY_MAX_LEN,
+    UNKNOWN_VALUE_MAX_LEN,
+)
+from custom_components.torque_logger_2025.session import SessionStore, UnknownKeys
+
+
+def test_unknown_keys_footprint_is_bounded_with_huge_keys() -> None:
+    # Sans troncature des clés : plus de 64 × 8 Kio
+    bound = MAX_UNKNOWN_KEYS * (UNKNOWN_KEY_MAX_LEN + UNKNOWN_VALUE_MAX_LEN) * 8
+
+    unknown = UnknownKeys()
+    for i in range(MAX_UNKNOWN_KEYS * 4):
+        unknown.add(f"{i:0{UNKNOWN_KEY_MAX_LEN}d}" + "x" * 8192, "v" * 8192)
+    assert len(unknown) == MAX_UNKNOWN_KEYS
+    assert all(len(key) <= UNKNOWN_KEY_MAX_LEN for key in unknown.as_dict()["keys"])
+    assert unknown.memory_footprint() <= bound
+
+
+def test_vehicle_name_kept_while_another_session_uses_the_id() -> None:
+    """L'index id -> nom survit à l'éviction d'une session tant qu'une autre l'utilise."""
+    store = SessionStore(max_sessions=2, ttl=60)
+    first = store.touch("1", now=0.0)
+    store.update_profile(first, {"id": "car", "Name": "Old name"})
+    second = store.touch("2", now=10.0)
+    store.update_profile(second, {"id": "car", "Name": "My car"})
+    assert store.vehicle_name("car") == "My car"
+
+    # Purge de la session la plus récente : le nom de l'autre session reste connu
+    store.touch("1", now=50.0)
+    assert store.purge_expired(now=75.0) == 1
+    assert "2" not in store
+    assert store.vehicle_name("car") == "Old name"
+
+    # Éviction LRU de la dernière session : l'id est oublié
+    store.touch("3", now=80.0)
+    store.touch("4", now=81.0)
+    assert "1" not in store
+    assert store.vehicle_name("car") is None
+    assert store.diagnostics()["profiles_indexed"] == 0
+
+
+def test_vehicle_name_without_id() -> None:
+    store = SessionStore()
+    rec = store.touch("1", now=0.0)
+    store.update_profile(rec, {"Name": "My car"})
+    assert store.vehicle_name(None) is None
+    store.purge_expired(now=store.ttl + 1)
+    assert len(store) == 0
@@ -0,0 +1,18 @@
+"""Tests des valeurs et réglages par unité."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.torque_logger_2025.values import parse_unit_thresholds
+
+
+def test_parse_unit_thresholds() -> None:
+    assert parse_unit_thresholds("°C=0.5; rpm = 50\nV=0,05") == {"°C": 0.5, "rpm": 50.0, "V": 0.05}
+    assert parse_unit_thresholds("") == {}
+    assert parse_unit_thresholds(None) == {}
+
+
+@pytest.mark.parametrize("text", ["0.5", "°C", "=1", "°C=abc", "°C=-1", "rpm=inf"])
+def test_parse_unit_thresholds_rejects_malformed(text: str) -> None:
+    with pytest.raises(ValueError):
+        parse_unit_thresholds(text)